@@ -16,7 +16,8 @@ setup(
     url='https://github.com/htmue/python-wishes',
     packages=['wishes'],
     package_data=dict(wishes=['*.yaml']),
-    install_requires=['PyYAML', 'six'],
+    install_requires=['six'],
+    extras_require=dict(pytest=['pytest>=7']),
 )
 
 #.............................................................................
@@ -0,0 +1,95 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_cache.py --- Parse cache vows
+#=============================================================================
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+
+import mock
+from should_dsl import should, should_not
+
+from wishes.cache import ParseCache
+from wishes.compat import unittest
+from wishes.loader import Loader
+from wishes.nodes import FeatureNode
+
+
+class ParseCacheVows(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cached.feature')
+        self.write('Feature: cached\n  Scenario: one\n')
+        self.loader = Loader(cache_dir=os.path.join(self.directory, 'cache'))
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def write(self, source):
+        with open(self.path, 'wb') as stream:
+            stream.write(source.encode('utf-8'))
+    
+    def names(self, suite):
+        return [test._testMethodName for test in suite]
+    
+    def test_stores_nodes_by_path_and_content(self):
+        cache = ParseCache(self.directory)
+        feature = FeatureNode('cached.feature', 'cached', blocks=[])
+        cache.save(self.path, 'digest', feature)
+        cache.load(self.path, 'digest') |should| be_equal_to(feature)
+        cache.load(self.path, 'changed') |should| be(None)
+    
+    def test_keeps_entries_by_encoding(self):
+        self.write('Feature: caf\xe9\n')
+        self.loader.parse_feature_file(self.path).title |should| be_equal_to('caf\xe9')
+        self.loader.parse_feature_file(self.path, encoding='latin-1').title |should| be_equal_to('caf\xc3\xa9')
+        self.loader.parse_feature_file(self.path).title |should| be_equal_to('caf\xe9')
+    
+    def test_depends_on_all_of_the_grammar(self):
+        stamp = ParseCache(self.directory).stamp
+        with mock.patch.dict('wishes.grammar.config', guards={}):
+            ParseCache(self.directory).stamp |should_not| be_equal_to(stamp)
+    
+    def test_replaces_existing_entries(self):
+        cache = ParseCache(self.directory)
+        cache.save(self.path, 'digest', FeatureNode('cached.feature', 'old', blocks=[]))
+        cache.save(self.path, 'digest', FeatureNode('cached.feature', 'new', blocks=[]))
+        cache.load(self.path, 'digest').title |should| be_equal_to('new')
+    
+    def test_removes_temporary_file_if_saving_fails(self):
+        cache = ParseCache(os.path.join(self.directory, 'cache'))
+        with mock.patch('wishes.cache.replace', side_effect=OSError):
+            (lambda: cache.save(self.path, 'digest', FeatureNode('cached.feature', 'cached', blocks=[]))) |should| throw(OSError)
+        os.listdir(cache.directory) |should| be_empty
+    
+    def test_loads_unchanged_feature_without_parsing(self):
+        self.names(self.loader.load_feature_file(self.path)) |should| each_be_equal_to(['test_Scenario_one'])
+        with mock.patch('wishes.loader.parse_parallel') as parse_parallel:
+            suite = self.loader.load_feature_file(self.path)
+        parse_parallel.called |should| be(False)
+        self.names(suite) |should| each_be_equal_to(['test_Scenario_one'])
+    
+    def test_parses_changed_feature_again(self):
+        self.loader.load_feature_file(self.path)
+        self.write('Feature: cached\n  Scenario: two\n')
+        self.names(self.loader.load_feature_file(self.path)) |should| each_be_equal_to(['test_Scenario_two'])
+    
+    def test_names_cached_feature_by_path_it_is_loaded_from(self):
+        self.write('Feature: cached\n  Scenario Outline: <n>\n  Examples: [from data.csv]\n')
+        with open(os.path.join(self.directory, 'data.csv'), 'wb') as stream:
+            stream.write(b'n\none\n')
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        os.chdir(os.path.dirname(self.directory))
+        first = os.path.join(os.path.basename(self.directory), 'cached.feature')
+        self.names(self.loader.load_feature_file(first)) |should| each_be_equal_to(['test_Scenario_one_1_Example_from_datacsv'])
+        os.chdir(self.directory)
+        self.loader.parse_feature_file('cached.feature').name |should| be_equal_to('cached.feature')
+        self.names(self.loader.load_feature_file('cached.feature')) |should| each_be_equal_to(['test_Scenario_one_1_Example_from_datacsv'])
+
+#.............................................................................
+#   test_cache.py
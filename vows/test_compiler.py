@@ -0,0 +1,164 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_compiler.py --- Feature compiler vows
+#=============================================================================
+from __future__ import unicode_literals
+
+import os
+import runpy
+import shutil
+import tempfile
+import warnings
+
+import mock
+from should_dsl import should
+
+from wishes import compiler, loader
+from wishes.compat import unittest
+from wishes.feature import StepDefinition, define_step
+
+
+feature_source = '''\
+Feature: compiled
+  Background:
+    Given a value of 1
+  Scenario: plain
+    Given a value of 2
+    Then the values are 1 2
+  Scenario Outline: outlined
+    Given a value of <value>
+    Then the values are <values>
+  Examples: values
+    | value | values |
+    | 3     | 1 3    |
+    | 4     | 1 4    |
+  Scenario: undefined
+    Given an undefined step
+'''
+
+def a_value_of(step, value):
+    step.world.values = getattr(step.world, 'values', []) + [value]
+
+def the_values_are(step, values):
+    ' '.join(step.world.values) |should| be_equal_to(values)
+
+def a_named_value(step, value):
+    step.match.group(1) |should| be_equal_to(value)
+    step.match.groupdict() |should| be_equal_to(dict(value=value))
+    a_value_of(step, value)
+
+
+class CompilerVows(unittest.TestCase):
+    
+    def setUp(self):
+        StepDefinition.clear()
+        define_step(r'a value of (\d+)', a_value_of)
+        define_step(r'the values are ([\d ]+)', the_values_are)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'compiled.feature')
+        self.write(feature_source)
+    
+    def tearDown(self):
+        StepDefinition.clear()
+        shutil.rmtree(self.directory)
+    
+    def write(self, source):
+        with open(self.path, 'wb') as stream:
+            stream.write(source.encode('utf-8'))
+    
+    def load(self, target):
+        return runpy.run_path(target)['Feature_compiled']
+    
+    def test_writes_module_beside_feature_file(self):
+        target = compiler.compile_feature(self.path)
+        target |should| be_equal_to(os.path.join(self.directory, 'test_compiled.py'))
+    
+    def test_module_has_test_case_with_expanded_scenarios(self):
+        Feature = self.load(compiler.compile_feature(self.path))
+        issubclass(Feature, unittest.TestCase) |should| be(True)
+        names = unittest.defaultTestLoader.getTestCaseNames(Feature)
+        expected = [test._testMethodName for test in loader.load_feature_file(self.path)]
+        list(names) |should| each_be_equal_to(expected)
+    
+    def test_runs_without_matching_steps(self):
+        Feature = self.load(compiler.compile_feature(self.path))
+        with mock.patch.object(StepDefinition, 'get_step_definitions') as get_step_definitions:
+            suite = Feature.make_suite()
+        get_step_definitions.called |should| be(False)
+        result = unittest.TestResult()
+        suite.run(result)
+        result.testsRun |should| be(4)
+        result.failures |should| be_equal_to([])
+        result.errors |should| be_equal_to([])
+        [reason for test, reason in result.skipped] |should| each_be_equal_to([
+            'pending 1 step(s): [<Given an undefined step>]',
+        ])
+    
+    def test_matches_steps_defined_after_build(self):
+        StepDefinition.clear()
+        target = compiler.compile_feature(self.path)
+        define_step(r'a value of (\d+)', a_value_of)
+        define_step(r'the values are ([\d ]+)', the_values_are)
+        result = unittest.TestResult()
+        self.load(target)('test_Scenario_plain').run(result)
+        result.testsRun |should| be(1)
+        result.wasSuccessful() |should| be(True)
+        result.skipped |should| be_equal_to([])
+    
+    def test_binds_steps_to_full_matches(self):
+        StepDefinition.clear()
+        define_step(r'a value of (?P<value>2)', a_named_value)
+        define_step(r'a value of ([13-9])', a_value_of)
+        define_step(r'the values are ([\d ]+)', the_values_are)
+        result = unittest.TestResult()
+        self.load(compiler.compile_feature(self.path))('test_Scenario_plain').run(result)
+        result.wasSuccessful() |should| be(True)
+    
+    def test_rebuilds_only_stale_modules(self):
+        list(compiler.compile_features([self.path])) |should| have(1).items
+        list(compiler.compile_features([self.path])) |should| have(0).items
+        self.write(feature_source + '  Scenario: added\n')
+        list(compiler.compile_features([self.path])) |should| have(1).items
+    
+    def test_names_modules_in_target_dir_by_feature_directory(self):
+        target_dir = os.path.join(self.directory, 'out')
+        os.mkdir(target_dir)
+        paths = []
+        for name in ('a', 'b'):
+            os.mkdir(os.path.join(self.directory, name))
+            paths.append(os.path.join(self.directory, name, 'compiled.feature'))
+            shutil.copy(self.path, paths[-1])
+        list(compiler.compile_features(paths, target_dir)) |should| each_be_equal_to([
+            os.path.join(target_dir, 'test_a_compiled.py'),
+            os.path.join(target_dir, 'test_b_compiled.py'),
+        ])
+        list(compiler.compile_features(paths, target_dir)) |should| have(0).items
+    
+    def test_rejects_features_compiled_into_the_same_module(self):
+        target_dir = os.path.join(self.directory, 'out')
+        os.mkdir(target_dir)
+        other = os.path.join(self.directory, 'Compiled.feature')
+        shutil.copy(self.path, other)
+        (lambda: list(compiler.compile_features([self.path, other], target_dir))) |should| throw(ValueError)
+    
+    def test_rebuilds_modules_of_other_feature_files(self):
+        target_dir = os.path.join(self.directory, 'out')
+        os.mkdir(target_dir)
+        list(compiler.compile_features([self.path], target_dir)) |should| have(1).items
+        other = os.path.join(self.directory, 'other')
+        os.mkdir(other)
+        shutil.copy(self.path, other)
+        path = os.path.join(other, 'compiled.feature')
+        list(compiler.compile_features([path], target_dir)) |should| have(1).items
+    
+    def test_warns_about_changed_feature_file(self):
+        target = compiler.compile_feature(self.path)
+        self.write(feature_source + '  Scenario: added\n')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.load(target)
+        [warning.category for warning in caught] |should| each_be_equal_to([compiler.StaleModuleWarning])
+
+#.............................................................................
+#   test_compiler.py
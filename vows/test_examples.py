@@ -0,0 +1,142 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_examples.py --- External examples source vows
+#=============================================================================
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+from functools import partial
+
+import mock
+from should_dsl import should
+
+from wishes import examples, loader
+from wishes.compat import unittest
+from wishes.feature import OutlineExample, StepDefinition, World, step
+
+
+feature_source = '''\
+Feature: external examples
+  Scenario Outline: <name> is <age>
+    Given <name> is <age>
+  Examples: people [from people.csv]
+  Examples: selected [from people.csv]
+    | age |
+  Examples: [from people.jsonl]
+  Examples: [from people()]
+'''
+
+people_csv = '''\
+name,age,note
+alice,31,"quoted, with comma"
+bob,42,"spans
+two lines"
+'''
+
+people_jsonl = '''\
+{"name": "carol", "age": 23}
+
+{"name": "dave", "age": 54}
+'''
+
+def people():
+    yield dict(name='eve', age='65')
+
+def names_and_ages():
+    yield ['frank', 12]
+
+
+class ExamplesSourceVows(unittest.TestCase):
+    
+    def setUp(self):
+        StepDefinition.clear()
+        self.directory = tempfile.mkdtemp()
+        for name, source in [
+            ('external.feature', feature_source),
+            ('people.csv', people_csv),
+            ('people.jsonl', people_jsonl),
+        ]:
+            with open(os.path.join(self.directory, name), 'wb') as stream:
+                stream.write(source.encode('utf-8'))
+        self.generators = mock.patch.dict(examples.generators, people=people, names_and_ages=names_and_ages)
+        self.generators.start()
+    
+    def tearDown(self):
+        self.generators.stop()
+        shutil.rmtree(self.directory)
+    
+    def path(self, name):
+        return os.path.join(self.directory, name)
+    
+    def test_finds_sources_in_examples_titles(self):
+        examples.find_source('people [from data/people.csv]', self.path('x.feature')).path |should| be_equal_to(
+            os.path.join(self.directory, 'data', 'people.csv'))
+        examples.find_source('[from people.jsonl]') |should| be_instance_of(examples.JsonLinesSource)
+        examples.find_source('[from people()]') |should| be_instance_of(examples.GeneratorSource)
+        examples.find_source('people from the office') |should| be(None)
+        examples.find_source('values taken from setup()') |should| be(None)
+        examples.find_source('from users.csv') |should| be(None)
+        partial(examples.find_source, '[from unknown()]') |should| throw(ValueError)
+    
+    def test_reads_csv_rows_by_offset(self):
+        source = examples.CsvSource(self.path('people.csv'))
+        rows = list(source)
+        [values for offset, values in rows] |should| each_be_equal_to([
+            ('alice', '31', 'quoted, with comma'),
+            ('bob', '42', 'spans\ntwo lines'),
+        ])
+        source.keys |should| be_equal_to(('name', 'age', 'note'))
+        source.read(rows[1][0]) |should| be_equal_to(('bob', '42', 'spans\ntwo lines'))
+    
+    def test_selects_keys_of_examples_table(self):
+        source = examples.JsonLinesSource(self.path('people.jsonl'))
+        source.select(['age'])
+        [values for offset, values in source] |should| each_be_equal_to([('23',), ('54',)])
+    
+    def test_requires_keys_for_rows_of_values(self):
+        source = examples.GeneratorSource('names_and_ages')
+        partial(list, source) |should| throw(ValueError)
+        source.select(['name', 'age'])
+        [values for handle, values in source] |should| each_be_equal_to([('frank', '12')])
+    
+    def test_names_examples_without_keeping_rows(self):
+        suite = loader.load_feature_file(self.path('external.feature'))
+        [test._testMethodName for test in suite] |should| each_be_equal_to([
+            'test_Scenario_alice_is_31_1_Example_people_from_peoplecsv',
+            'test_Scenario_bob_is_42_2_Example_people_from_peoplecsv',
+            'test_Scenario_carol_is_23_1_Example_from_peoplejsonl',
+            'test_Scenario_dave_is_54_2_Example_from_peoplejsonl',
+            'test_Scenario_eve_is_65_1_Example_from_people',
+            'test_Scenario_name_is_31_1_Example_selected_from_peoplecsv',
+            'test_Scenario_name_is_42_2_Example_selected_from_peoplecsv',
+        ])
+        example = list(suite)[0].scenarios['test_Scenario_alice_is_31_1_Example_people_from_peoplecsv']
+        example |should| be_instance_of(OutlineExample)
+        example.row |should| be(14)
+    
+    def test_rejects_rows_below_sources(self):
+        with open(self.path('rows.feature'), 'wb') as stream:
+            stream.write(b'Feature: rows\n  Scenario Outline: <name>\n  Examples: [from people.csv]\n'
+                b'    | name |\n    | frank |\n')
+        partial(loader.load_feature_file, self.path('rows.feature')) |should| throw(ValueError)
+    
+    def test_runs_examples_from_source(self):
+        @step(r'(\S+) is (\d+)')
+        def is_aged(step, name, age):
+            my_world.people.append((name, age))
+        my_world = World()
+        my_world.people = []
+        result = unittest.TestResult()
+        loader.load_feature_file(self.path('external.feature')).run(result)
+        result.testsRun |should| be(7)
+        result.wasSuccessful() |should| be(True)
+        sorted(my_world.people) |should| each_be_equal_to([
+            ('<name>', '31'), ('<name>', '42'),
+            ('alice', '31'), ('bob', '42'), ('carol', '23'), ('dave', '54'), ('eve', '65'),
+        ])
+
+#.............................................................................
+#   test_examples.py
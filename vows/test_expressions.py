@@ -0,0 +1,91 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_expressions.py --- Cucumber expression vows
+#=============================================================================
+from __future__ import unicode_literals
+
+import mock
+from should_dsl import should
+
+from wishes import expressions
+from wishes.compat import unittest
+from wishes.expressions import Expression, ExpressionError, compile_expression
+
+
+def match(expression, text, kind='Given'):
+    expression = Expression(expression)
+    found = expression.pattern.match(' '.join((kind, text)))
+    return None if found is None else expression.convert(found.groups())
+
+
+class ExpressionVows(unittest.TestCase):
+    
+    def test_matches_the_whole_text(self):
+        match('there is a step', 'there is a step') |should| be_equal_to([])
+        match('there is a step', 'there is a step too') |should| be(None)
+        match('is a step', 'there is a step') |should| be(None)
+    
+    def test_ignores_case_and_whitespace(self):
+        match('there is a step', 'There  is a\tSTEP ') |should| be_equal_to([])
+    
+    def test_converts_parameters(self):
+        match('{int} and {float} are {word}', '-12 and 1.5 are numbers') |should| be_equal_to(
+            [-12, 1.5, 'numbers'])
+    
+    def test_strips_quotes_of_strings(self):
+        match('a {string} and a {string}', 'a "double quoted" and a \'single\'') |should| be_equal_to(
+            ['double quoted', 'single'])
+    
+    def test_matches_anything_by_anonymous_parameters(self):
+        match('a {} step', 'a rather big step') |should| be_equal_to(['rather big'])
+    
+    def test_matches_optional_text(self):
+        match('{int} cucumber(s)', '1 cucumber') |should| be_equal_to([1])
+        match('{int} cucumber(s)', '2 cucumbers') |should| be_equal_to([2])
+    
+    def test_matches_alternative_words(self):
+        match('in my belly/stomach', 'in my stomach') |should| be_equal_to([])
+        match('in my belly/stomach', 'in my head') |should| be(None)
+    
+    def test_escapes_special_characters(self):
+        match(r'a \(big\) \{int\} step', 'a (big) {int} step') |should| be_equal_to([])
+        match('a step?', 'a step?') |should| be_equal_to([])
+    
+    def test_has_the_words_of_plain_expressions_as_literal(self):
+        Expression('There  is \\(a\\) Step').literal |should| be_equal_to('there is (a) step')
+        Expression('{int} steps').literal |should| be(None)
+        Expression('a step(s)').literal |should| be(None)
+        Expression('a/an step').literal |should| be(None)
+    
+    def test_complains_about_bad_expressions(self):
+        for text in ('', 'a {unknown} step', 'a (step', 'a step)', '((a))', 'a/{int}', 'a/ step',
+                'a (b/c)', 'a ({int})', 'a {int step'):
+            (lambda: Expression(text)) |should| throw(ExpressionError)
+
+
+class ParameterTypeVows(unittest.TestCase):
+    
+    def setUp(self):
+        for registry in (expressions.parameter_types, expressions.expressions):
+            patcher = mock.patch.dict(registry)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_can_be_registered(self):
+        @expressions.parameter_type('color', 'red|green|blue')
+        def color(text):
+            return text.upper()
+        match('a {color} step', 'a green step') |should| be_equal_to(['GREEN'])
+    
+    def test_may_have_groups(self):
+        expressions.define_parameter_type('point', r'(\d+),(\d+)', lambda text: tuple(map(int, text.split(','))))
+        match('from {point} to {point}', 'from 1,2 to 3,4') |should| be_equal_to([(1, 2), (3, 4)])
+    
+    def test_clears_compiled_expressions(self):
+        compile_expression('a {word} step') |should| be(compile_expression('a {word} step'))
+        expressions.define_parameter_type('word', r'\w+')
+        compile_expression('a {word} step').regexp |should| contain(r'(\w+)')
+
+#.............................................................................
+#   test_expressions.py
@@ -295,6 +295,25 @@ class FeatureVows(unittest.TestCase):
             'first', 'step', 'second', 'step',
         ])
     
+    def test_expands_outline_examples_only_when_run(self):
+        feature = load_feature('''
+        Feature: with large examples
+          Scenario Outline: follows
+            Given a <key>
+          Examples:
+            | key   |
+            | first |
+            | other |
+        ''')
+        with mock.patch('wishes.feature.Step') as Step:
+            tests = list(feature)
+            [test.shortDescription() for test in tests] |should| each_be_equal_to([
+                'Scenario: follows', 'Scenario: follows',
+            ])
+            feature.countTestCases() |should| be(2)
+        Step.called |should| be(False)
+        tests[1].scenario.steps[0].text |should| be_equal_to('a other')
+    
     def run_feature_with_result_step_handlers(self, feature, *handlers):
         result = unittest.TestResult()
         for handler in ['startStep', 'stopStep'] + list(handlers):
@@ -0,0 +1,124 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_index.py --- Feature index vows
+#=============================================================================
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+from functools import partial
+
+from should_dsl import should
+
+from wishes import loader
+from wishes.compat import unittest
+from wishes.index import FeatureIndex
+
+
+feature_source = '''\
+@feature
+Feature: indexed
+  Background: first
+    Given a background
+  Scenario: one
+    Given a step
+  @tagged
+  Scenario: two
+    Given a step
+  Scenario Outline: three
+    Given a <value>
+  Examples: first
+    | value |
+    | 1     |
+  Examples: second
+    | value |
+    | 2     |
+'''
+
+class FeatureFile(object):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'indexed.feature')
+        with open(self.path, 'wb') as stream:
+            stream.write(feature_source.encode('utf-8'))
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+class FeatureIndexVows(FeatureFile, unittest.TestCase):
+    
+    def test_records_blocks_with_line_ranges(self):
+        index = FeatureIndex.build(self.path)
+        [(block['kind'], block['title'], block['first'], block['last']) for block in index.blocks] |should| each_be_equal_to([
+            ('background', 'first', 3, 4),
+            ('scenario', 'one', 5, 6),
+            ('scenario', 'two', 7, 9),
+            ('outline', 'three', 10, 11),
+            ('examples', 'first', 12, 14),
+            ('examples', 'second', 15, 17),
+        ])
+    
+    def test_records_byte_offsets_of_blocks(self):
+        index = FeatureIndex.build(self.path)
+        block = index.blocks[2]
+        source = feature_source.encode('utf-8')
+        source[block['start']:block['stop']] |should| be_equal_to(b'  @tagged\n  Scenario: two\n    Given a step\n')
+    
+    def test_stores_index_beside_feature_file(self):
+        FeatureIndex.load(self.path)
+        os.path.exists(os.path.join(self.directory, '.indexed.feature.idx')) |should| be(True)
+    
+    def test_can_store_index_in_cache_dir(self):
+        cache_dir = os.path.join(self.directory, 'cache')
+        FeatureIndex.load(self.path, cache_dir)
+        os.listdir(cache_dir) |should| have(1).items
+    
+    def test_rebuilds_index_when_feature_file_changes(self):
+        FeatureIndex.load(self.path)
+        with open(self.path, 'ab') as stream:
+            stream.write(b'  Scenario: four\n')
+        index = FeatureIndex.load(self.path)
+        index.blocks[-1]['title'] |should| be_equal_to('four')
+    
+    def test_selects_scenario_with_background(self):
+        index = FeatureIndex.build(self.path)
+        index.find(line=6) |should| each_be_equal_to([0, 1])
+        index.find(title='two') |should| each_be_equal_to([0, 2])
+    
+    def test_selects_outline_with_examples(self):
+        index = FeatureIndex.build(self.path)
+        index.find(line=10) |should| each_be_equal_to([0, 3, 4, 5])
+        index.find(line=16) |should| each_be_equal_to([0, 3, 5])
+    
+    def test_selects_nothing_outside_of_scenarios(self):
+        index = FeatureIndex.build(self.path)
+        index.find(line=2) |should| be(None)
+        index.find(line=4) |should| be(None)
+
+
+class ScenarioLoaderVows(FeatureFile, unittest.TestCase):
+    
+    def test_loads_scenario_by_line(self):
+        suite = loader.load_scenario(self.path, line=8)
+        [test._testMethodName for test in suite] |should| each_be_equal_to(['test_Scenario_two'])
+        test_case = list(suite)[0]
+        test_case.scenario.background.title |should| be_equal_to('first')
+    
+    def test_loads_examples_by_line(self):
+        suite = loader.load_scenario(self.path, line=17)
+        [test._testMethodName for test in suite] |should| each_be_equal_to(['test_Scenario_three_1_Example_second'])
+    
+    def test_loads_whole_feature_for_line_outside_of_scenarios(self):
+        suite = loader.load_scenario(self.path, line=1)
+        suite.countTestCases() |should| be(4)
+    
+    def test_rejects_unknown_title(self):
+        load_scenario = partial(loader.load_scenario, self.path, title='unknown')
+        load_scenario |should| throw(ValueError)
+
+#.............................................................................
+#   test_index.py
@@ -5,14 +5,21 @@
 #=============================================================================
 from __future__ import unicode_literals
 
+import gc
+import os
+import shutil
+import tempfile
+import threading
+import weakref
 from functools import partial
 
+import mock
 import six
 from should_dsl import should
 
 from wishes import loader
 from wishes.compat import unittest
-from wishes.feature import Scenario, get_tags
+from wishes.feature import Scenario, StepDefinition, StepDefinitionError, World, get_tags, step, step_registry
 
 
 class LoaderVows(unittest.TestCase):
@@ -66,6 +73,25 @@ class LoaderVows(unittest.TestCase):
         ''')
         feature.countTestCases() |should| be(2)
     
+    def test_keeps_scenario_table_per_feature(self):
+        first = loader.load_feature('Feature: first\n  Scenario: one\n')
+        second = loader.load_feature('Feature: second\n  Scenario: two\n')
+        first_case, second_case = six.next(iter(first)), six.next(iter(second))
+        list(first_case.scenarios) |should| each_be_equal_to(['test_Scenario_one'])
+        list(second_case.scenarios) |should| each_be_equal_to(['test_Scenario_two'])
+    
+    def test_builds_suite_without_searching_test_case_class(self):
+        with mock.patch.object(unittest.defaultTestLoader, 'getTestCaseNames') as getTestCaseNames:
+            feature = loader.load_feature('''
+            Feature: Load feature file
+              Scenario: second one
+              Scenario: first one
+            ''')
+        getTestCaseNames.called |should| be(False)
+        [test._testMethodName for test in feature] |should| each_be_equal_to([
+            'test_Scenario_first_one', 'test_Scenario_second_one',
+        ])
+    
     def test_marks_scenarios_without_steps_as_skipped(self):
         feature = loader.load_feature('''
         Feature: Load feature file
@@ -169,7 +195,20 @@ class LoaderVows(unittest.TestCase):
         ''')
         test_case = six.next(iter(feature))
         test_case.description |should| be_equal_to('With description')
-
+    
+    def test_loads_feature_from_file(self):
+        with tempfile.NamedTemporaryFile(suffix='.feature', delete=False) as stream:
+            stream.write(b'''
+            Feature: Load feature file
+              Scenario: Has a nice Title
+            '''.strip())
+        try:
+            feature = loader.load_feature_file(stream.name)
+        finally:
+            os.remove(stream.name)
+        test_case = six.next(iter(feature))
+        test_case.scenario.title |should| be_equal_to('Has a nice Title')
+    
     def test_loads_feature_with_comment(self):
         feature = loader.load_feature('''
         # comment
@@ -178,6 +217,146 @@ class LoaderVows(unittest.TestCase):
         len(list(feature)) |should| be(1)
 
 
+class DiscoveryVows(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for path, source in [
+            ('b.feature', 'Feature: b\n  @smoke\n  Scenario: b\n'),
+            ('a.feature', 'Feature: a\n  @smoker\n  Scenario: a\n'),
+            ('notes.txt', 'not a feature'),
+            ('sub/c.feature', '@smoke\nFeature: c\n  Scenario: c\n'),
+            ('build/d.feature', 'Feature: d\n  Scenario: d\n'),
+        ]:
+            path = os.path.join(self.directory, path)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as stream:
+                stream.write(source.encode('utf-8'))
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def relative(self, paths):
+        return [os.path.relpath(path, self.directory).replace(os.sep, '/') for path in paths]
+    
+    def test_finds_feature_files_in_sorted_order(self):
+        paths = loader.find_features(self.directory)
+        self.relative(paths) |should| each_be_equal_to(['a.feature', 'b.feature', 'build/d.feature', 'sub/c.feature'])
+    
+    def test_skips_excluded_files_and_directories(self):
+        paths = loader.find_features(self.directory, exclude=['build', 'sub/*'])
+        self.relative(paths) |should| each_be_equal_to(['a.feature', 'b.feature'])
+    
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'needs symbolic links')
+    def test_does_not_follow_directory_links(self):
+        os.symlink('..', os.path.join(self.directory, 'sub', 'loop'))
+        paths = loader.find_features(self.directory)
+        self.relative(paths) |should| each_be_equal_to(['a.feature', 'b.feature', 'build/d.feature', 'sub/c.feature'])
+    
+    def test_can_prefilter_files_by_tags(self):
+        suite = loader.discover(self.directory, tags=['smoke'])
+        [six.next(iter(feature)).title for feature in suite] |should| each_be_equal_to(['b', 'c'])
+    
+    def test_provides_load_tests_protocol(self):
+        load_tests = loader.make_load_tests(self.directory, exclude=['sub'])
+        tests = load_tests(unittest.defaultTestLoader, unittest.TestSuite(), None)
+        tests.countTestCases() |should| be(3)
+    
+    def test_can_filter_by_tag_expression(self):
+        suite = loader.discover(self.directory, tags='not @smoke')
+        [six.next(iter(feature)).title for feature in suite if feature.countTestCases()] |should| each_be_equal_to(['a', 'd'])
+    
+    def test_can_stream_features(self):
+        suite = loader.discover(self.directory, lazy=True)
+        suite |should| be_instance_of(loader.LazySuite)
+        [six.next(iter(feature)).title for feature in suite] |should| each_be_equal_to(['a', 'b', 'd', 'c'])
+
+
+class LazySuiteVows(unittest.TestCase):
+    
+    def test_builds_features_when_iterated(self):
+        feature = mock.Mock(return_value=loader.load_feature('Feature: lazy\n  Scenario: one\n'))
+        suite = loader.LazySuite([feature])
+        feature.called |should| be(False)
+        suite.countTestCases() |should| be(1)
+        feature.call_count |should| be(1)
+    
+    def test_runs_like_a_test_suite(self):
+        suite = loader.LazySuite([
+            partial(loader.load_feature, 'Feature: first\n  Scenario: one\n  Scenario: two\n'),
+            partial(loader.load_feature, 'Feature: second\n  Scenario: three\n'),
+        ])
+        suite.addTest(loader.load_feature('Feature: eager\n  Scenario: four\n'))
+        result = unittest.TestResult()
+        suite.run(result)
+        result.testsRun |should| be(4)
+        len(result.skipped) |should| be(4)
+    
+    def test_drops_features_after_they_ran(self):
+        features = []
+        def feature():
+            suite = loader.load_feature('Feature: dropped\n  Scenario: one\n')
+            features.append(weakref.ref(type(six.next(iter(suite)))))
+            return suite
+        suite = loader.LazySuite([feature])
+        suite.run(unittest.TestResult())
+        gc.collect()
+        features[0]() |should| be(None)
+
+
+class TagFilterVows(unittest.TestCase):
+    
+    source = '''
+    Feature: filtered by tags
+      Background:
+        Given a background
+      @smoke
+      Scenario: smoke
+        Given a step
+      @slow
+      Scenario: slow
+        Given a step
+      Scenario Outline: outlined
+        Given a <value>
+      @smoke
+      Examples: smoke
+        | value |
+        | 1     |
+      Examples: other
+        | value |
+        | 2     |
+    '''
+    
+    def names(self, suite):
+        return [test._testMethodName for test in suite]
+    
+    def test_loads_only_matching_scenarios_and_examples(self):
+        suite = loader.load_feature(self.source, tags='@smoke')
+        self.names(suite) |should| each_be_equal_to([
+            'test_Scenario_outlined_1_Example_smoke', 'test_Scenario_smoke',
+        ])
+    
+    def test_supports_not(self):
+        suite = loader.load_feature(self.source, tags='not @slow and not @smoke')
+        self.names(suite) |should| each_be_equal_to(['test_Scenario_outlined_1_Example_other'])
+    
+    def test_matches_feature_tags(self):
+        suite = loader.load_feature('@smoke' + self.source, tags='@smoke and @slow')
+        self.names(suite) |should| each_be_equal_to(['test_Scenario_slow'])
+    
+    def test_does_not_build_steps_of_skipped_scenarios(self):
+        with mock.patch('wishes.feature.StepDefinition.get_step_definition', return_value=(None, None)) as get_step_definition:
+            loader.load_feature(self.source, tags='@slow')
+        [call[0][1] for call in get_step_definition.call_args_list] |should| each_be_equal_to([
+            'a background', 'a step', 'a <value>',
+        ])
+    
+    def test_loads_empty_suite_if_nothing_matches(self):
+        suite = loader.load_feature(self.source, tags='@unknown')
+        suite.countTestCases() |should| be(0)
+
+
 @unittest.skipIf(get_tags is None, 'get_tags() not available')
 class TagLoaderVows(unittest.TestCase):
     
@@ -303,5 +482,177 @@ class TagLoaderVows(unittest.TestCase):
         sorted(tags) |should| each_be_equal_to(['example', 'outline'])
 
 
+class StepRegistryVows(unittest.TestCase):
+    
+    source = '''
+        %s
+        Feature: registries
+          Scenario: plain
+            Given a scoped step
+          Scenario Outline: outline
+            Given a <what> step
+          Examples:
+            | what   |
+            | scoped |
+    '''
+    
+    def setUp(self):
+        StepDefinition.clear()
+        @step('a scoped step', using='web')
+        def a_scoped_step(step):
+            pass
+    
+    def tearDown(self):
+        StepDefinition.clear()
+    
+    def defined(self, suite):
+        return [test.scenario.steps[0].is_defined for test in suite]
+    
+    def test_is_not_used_by_default(self):
+        self.defined(loader.load_feature(self.source % '')) |should| each_be_equal_to([False, False])
+    
+    def test_is_used_by_name(self):
+        suite = loader.load_feature(self.source % '', using='web')
+        self.defined(suite) |should| each_be_equal_to([True, True])
+    
+    def test_must_exist_to_be_used_by_name(self):
+        (lambda: loader.load_feature(self.source % '', using='wbe')) |should| throw(ValueError)
+    
+    def test_is_used_by_tag(self):
+        step_registry('web', tag='@web')
+        self.defined(loader.load_feature(self.source % '@web')) |should| each_be_equal_to([True, True])
+        self.defined(loader.load_feature(self.source % '@api')) |should| each_be_equal_to([False, False])
+    
+    def test_is_used_by_directory(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for name in ('web', 'api'):
+            os.makedirs(os.path.join(directory, name))
+            with open(os.path.join(directory, name, 'a.feature'), 'wb') as stream:
+                stream.write((self.source % '').encode('utf-8'))
+        step_registry('web', directory=os.path.join(directory, 'web'))
+        suite = loader.discover(directory)
+        [self.defined(feature) for feature in suite] |should| each_be_equal_to([[False, False], [True, True]])
+    
+    def test_does_not_scope_directory_to_features_read_from_strings(self):
+        step_registry('web', directory=os.getcwd())
+        self.defined(loader.load_feature(self.source % '')) |should| each_be_equal_to([False, False])
+        self.defined(loader.load_feature(six.StringIO(self.source % ''))) |should| each_be_equal_to([False, False])
+    
+    def test_is_used_by_name_for_single_scenarios(self):
+        with tempfile.NamedTemporaryFile(suffix='.feature', delete=False) as stream:
+            stream.write((self.source % '').encode('utf-8'))
+        self.addCleanup(os.remove, stream.name)
+        self.defined(loader.load_scenario(stream.name, line=4, using='web')) |should| each_be_equal_to([True])
+        self.defined(loader.load_scenario(stream.name, line=1, using='web')) |should| each_be_equal_to([True, True])
+        self.defined(loader.load_scenario(stream.name, line=4)) |should| each_be_equal_to([False])
+    
+    def test_adds_to_global_step_definitions(self):
+        @step('a (.*) step')
+        def a_step(step, what):
+            pass
+        self.defined(loader.load_feature(self.source % '')) |should| each_be_equal_to([True, True])
+        (lambda: loader.load_feature(self.source % '', using='web')) |should| throw(StepDefinitionError)
+    
+    def test_allows_loading_features_concurrently(self):
+        @step('an api step', using='api')
+        def an_api_step(step):
+            pass
+        results = dict()
+        def load(using):
+            results[using] = [self.defined(loader.load_feature(self.source % '', using=using)) for n in range(20)]
+        threads = [threading.Thread(target=load, args=(using,)) for using in ('web', 'api')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results['web'] |should| each_be_equal_to([[True, True]] * 20)
+        results['api'] |should| each_be_equal_to([[False, False]] * 20)
+
+
+class DeferredBindingVows(unittest.TestCase):
+    
+    source = '''
+        Feature: deferred
+          Background:
+            Given a counted step
+          Scenario: plain
+            Given a counted step
+            And an undefined step
+            And a counted step
+          Scenario Outline: outline
+            Given a <what> step
+          Examples:
+            | what    |
+            | counted |
+    '''
+    
+    def setUp(self):
+        StepDefinition.clear()
+        self.loader = loader.Loader(deferred=True)
+    
+    def tearDown(self):
+        StepDefinition.clear()
+    
+    def define_steps(self):
+        world = self.world = World()
+        world.count = 0
+        @step('a counted step')
+        def a_counted_step(step):
+            world.count += 1
+    
+    def run_suite(self, suite):
+        result = unittest.TestResult()
+        suite.run(result)
+        return result
+    
+    def test_does_not_match_steps_while_loading(self):
+        with mock.patch('wishes.feature.StepDefinition.get_step_definition') as get_step_definition:
+            suite = self.loader.load_feature(self.source)
+        get_step_definition.called |should| be(False)
+        [test.scenario.steps[0].is_bound for test in suite] |should| each_be_equal_to([False, False])
+    
+    def test_matches_steps_defined_after_loading(self):
+        suite = self.loader.load_feature(self.source)
+        self.define_steps()
+        result = self.run_suite(suite)
+        result.testsRun |should| be(2)
+        result.errors |should| be_equal_to([])
+        self.world.count |should| be(4)
+    
+    def test_reports_undefined_steps_as_before(self):
+        self.define_steps()
+        expected = self.run_suite(loader.load_feature(self.source))
+        result = self.run_suite(self.loader.load_feature(self.source))
+        [reason for test, reason in result.skipped] |should| each_be_equal_to(
+            [reason for test, reason in expected.skipped])
+        [reason for test, reason in result.skipped] |should| each_be_equal_to([
+            'pending 1 step(s): [<And an undefined step>]',
+        ])
+    
+    def test_matches_all_steps_when_scenario_starts(self):
+        test, = [test for test in self.loader.load_feature(self.source) if test.scenario.title == 'plain']
+        self.define_steps()
+        test.scenario.bind_steps()
+        [step.is_bound for step in test.scenario.steps] |should| each_be_equal_to([True, True, True])
+        test.scenario.background.steps[0].is_bound |should| be(True)
+    
+    def test_uses_registries_defined_after_loading(self):
+        suite = loader.Loader(deferred=True).load_feature(self.source, using='later')
+        @step('a counted step', using='later')
+        def a_counted_step(step):
+            pass
+        [test.scenario.steps[0].is_defined for test in suite] |should| each_be_equal_to([True, True])
+    
+    def test_binds_steps_on_first_access(self):
+        test, = [test for test in self.loader.load_feature(self.source) if test.scenario.title != 'plain']
+        self.define_steps()
+        step_ = test.scenario.steps[0]
+        step_.text |should| be_equal_to('a counted step')
+        step_.is_defined |should| be(True)
+        step_.is_bound |should| be(True)
+
+
+
 #.............................................................................
 #   test_loader.py
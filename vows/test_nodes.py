@@ -0,0 +1,121 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_nodes.py --- Feature syntax tree vows
+#=============================================================================
+from __future__ import unicode_literals
+
+import pickle
+
+from should_dsl import should, should_not
+
+from wishes.compat import unittest
+from wishes.loader import Handler, Loader
+from wishes.nodes import FeatureNode, ScenarioNode, StepNode, ExamplesNode, make_parser
+from wishes.parser import Parser
+
+
+feature_source = '''\
+@feature
+Feature: nodes
+  Described
+  in two lines
+  
+  Background: first
+    Given a background
+  # comment
+  @tagged
+  Scenario: one
+    Given a multiline
+      """
+      text
+        indented
+      """
+    And a hash
+      | key   | value |
+      | one   | 1     |
+  Scenario Outline: two
+    Given a <value>
+  @examples
+  Examples: first
+    | value |
+    | 1     |
+    | 2     |
+'''
+
+def parse(source):
+    parser = make_parser()
+    parser.parse(source)
+    return parser.handler.feature
+
+def describe(suite):
+    return [(
+        test._testMethodName,
+        test.scenario.title,
+        test.scenario.tags,
+        [(step.kind, step.text, step.multilines, step.hashes.keys, step.hashes.values)
+            for step in test.scenario.steps],
+    ) for test in suite]
+
+
+class NodeBuilderVows(unittest.TestCase):
+    
+    def test_builds_feature_nodes(self):
+        feature = parse(feature_source)
+        feature.title |should| be_equal_to('nodes')
+        feature.tags |should| be_equal_to(('feature',))
+        feature.description |should| be_equal_to('Describedin two lines')
+        [(block.kind, block.title, block.tags, block.line) for block in feature.blocks] |should| each_be_equal_to([
+            ('background', 'first', None, 6),
+            ('scenario', 'one', ('tagged',), 10),
+            ('outline', 'two', None, 19),
+        ])
+    
+    def test_builds_step_nodes(self):
+        scenario = parse(feature_source).blocks[1]
+        scenario.steps |should| each_be_equal_to([
+            StepNode('Given', 'a multiline', ['text\n', '  indented\n']),
+            StepNode('And', 'a hash', keys=('key', 'value'), rows=[('one', '1')]),
+        ])
+    
+    def test_builds_examples_nodes(self):
+        outline = parse(feature_source).blocks[2]
+        outline.examples |should| each_be_equal_to([
+            ExamplesNode('first', ('examples',), 22, ('value',), [('1',), ('2',)]),
+        ])
+    
+    def test_builds_node_without_feature(self):
+        feature = parse('# only a comment\n')
+        feature.title |should| be(None)
+        Loader().build_suite(feature) |should| be(None)
+    
+    def test_can_be_pickled(self):
+        feature = parse(feature_source)
+        pickle.loads(pickle.dumps(feature, pickle.HIGHEST_PROTOCOL)) |should| be_equal_to(feature)
+    
+    def test_compare_by_value(self):
+        ScenarioNode('scenario', 'one') |should| be_equal_to(ScenarioNode('scenario', 'one'))
+        ScenarioNode('scenario', 'one') |should_not| be_equal_to(ScenarioNode('scenario', 'two'))
+        ScenarioNode('scenario', 'one') |should_not| be_equal_to(ExamplesNode('scenario', 'one'))
+    
+    def test_rejects_unknown_slots(self):
+        (lambda: FeatureNode(unknown=1)) |should| throw(TypeError)
+
+
+class NodeReplayVows(unittest.TestCase):
+    
+    def test_builds_suite_of_direct_parse(self):
+        handler = Handler()
+        Parser(handler).parse(feature_source)
+        describe(Loader().build_suite(parse(feature_source))) |should| each_be_equal_to(describe(handler.suite))
+    
+    def test_keeps_description_and_feature_class(self):
+        handler = Handler()
+        Parser(handler).parse(feature_source)
+        expected = list(handler.suite)[0]
+        feature = list(Loader().build_suite(parse(feature_source)))[0]
+        feature.description |should| be_equal_to(expected.description)
+        type(feature).__name__ |should| be_equal_to(type(expected).__name__)
+
+#.............................................................................
+#   test_nodes.py
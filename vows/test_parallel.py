@@ -0,0 +1,85 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_parallel.py --- Parallel parsing vows
+#=============================================================================
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+
+from should_dsl import should
+
+from wishes import loader
+from wishes.compat import unittest
+from wishes.parallel import iter_split_points, parse_parallel
+from wishes.parser import Parser
+
+
+def make_feature(count):
+    lines = ['@feature', 'Feature: generated', '  with description', '  Background: shared', '    Given a background']
+    for n in range(count):
+        if n % 3 == 0:
+            lines += ['  @tag_%d' % n, '  # comment', '  Scenario Outline: outline %d' % n, '    Given a <value>',
+                '      """', '      Scenario: inside multiline', '      """',
+                '  Examples: rows', '    | value |', '    | %d    |' % n, '']
+        else:
+            lines += ['  Scenario: scenario %d' % n, '    Given step %d' % n, '    | key |', '    | %d  |' % n]
+        if n == 7:
+            lines += ['  Background: another', '    Given another background']
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class ParallelVows(unittest.TestCase):
+    
+    def test_splits_only_between_scenarios(self):
+        source = make_feature(12)
+        for pos in iter_split_points(source):
+            line = source[pos:source.index(b'\n', pos)].strip()
+            (line.startswith(b'Scenario') or line.startswith(b'@tag')) |should| be(True)
+    
+    def test_parses_chunks_into_events_of_a_single_parse(self):
+        source = make_feature(30)
+        events = list(Parser(blocks=True).iter_events(source.decode('utf-8')))
+        events[0] = ('start_parse', ('generated.feature',), 0)
+        parse_parallel(source, 'generated.feature', 4, min_size=100) |should| each_be_equal_to(events)
+    
+    def test_loads_same_suite_as_serial_loading(self):
+        with tempfile.NamedTemporaryFile(suffix='.feature', delete=False) as stream:
+            stream.write(make_feature(3000))
+        try:
+            serial = loader.load_feature_file(stream.name)
+            parallel = loader.load_feature_file(stream.name, workers=3)
+        finally:
+            os.remove(stream.name)
+        names = lambda suite: [test.id() for test in suite]
+        names(parallel) |should| each_be_equal_to(names(serial))
+    
+    def test_loads_feature_files_into_one_suite_in_order(self):
+        directory = tempfile.mkdtemp()
+        try:
+            paths = []
+            for n in range(4):
+                paths.append(os.path.join(directory, '%d.feature' % n))
+                with open(paths[-1], 'wb') as stream:
+                    stream.write(('Feature: file %d\n  Scenario: first\n  Scenario: second\n' % n).encode('utf-8'))
+            suite = loader.load_features(reversed(paths), workers=2)
+        finally:
+            shutil.rmtree(directory)
+        [(test.title, test._testMethodName) for test in iterate_tests(suite)] |should| each_be_equal_to([
+            ('file %d' % n, 'test_Scenario_%s' % name)
+            for n in reversed(range(4)) for name in ('first', 'second')
+        ])
+
+
+def iterate_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            for test in iterate_tests(test):
+                yield test
+        else:
+            yield test
+
+#.............................................................................
+#   test_parallel.py
@@ -5,21 +5,25 @@
 #=============================================================================
 from __future__ import unicode_literals
 
+import itertools
 import os.path
 import re
+import tempfile
 from functools import partial
 
 import mock
 import six
 import yaml
-from should_dsl import should
+from should_dsl import should, should_not
 from io import StringIO
 
+from wishes import make_grammar
 from wishes.compat import unittest
-from wishes.parser import Parser, ParseError
+from wishes.parser import Parser, ParseError, ParseStats
 
 
-test_data = yaml.load(open(os.path.splitext(__file__)[0] + '.yaml'))
+with open(os.path.splitext(__file__)[0] + '.yaml') as stream:
+    test_data = yaml.safe_load(stream)
 
 class ParserCallbackVowsMeta(type):
     
@@ -46,6 +50,23 @@ def parse_log_check(input, callbacks):
     handler.method_calls |should| each_be_equal_to(method_calls)
 
 
+class BlockExpander(object):
+    
+    def __init__(self, handler):
+        self.handler = handler
+    
+    def hash_data_block(self, rows):
+        for row in rows:
+            self.handler.hash_data(*row)
+    
+    def data_block(self, lines):
+        for line in lines:
+            self.handler.data(line)
+    
+    def __getattr__(self, key):
+        return getattr(self.handler, key)
+
+
 @six.add_metaclass(ParserCallbackVowsMeta)
 class ParserVows(unittest.TestCase):
     
@@ -71,6 +92,166 @@ class ParserVows(unittest.TestCase):
         '''.strip())
         parse |should| throw(ParseError)
     
+    def test_treats_multiline_quotes_with_other_indent_as_data(self):
+        handler = mock.Mock()
+        parser = Parser(handler)
+        parser.parse('''
+        Feature: nested multiline quotes
+          Scenario: with multiline step
+            Given a multiline:
+              """
+                """
+              """
+        '''.strip())
+        handler.data.assert_called_once_with('  """\n')
+    
+    def test_shares_compiled_states_between_instances(self):
+        Parser().states |should| be(Parser().states)
+    
+    def test_compiles_states_per_parser_subclass(self):
+        class MyParser(Parser):
+            pass
+        MyParser().states |should_not| be(Parser().states)
+    
+    def test_uses_frozen_grammar_in_sync_with_parser_yaml(self):
+        Parser.config |should| be_equal_to(make_grammar.load_config())
+    
+    def test_can_iterate_events_with_line_numbers(self):
+        events = Parser().iter_events('''
+        Feature: iterate events
+          @tag
+          Scenario: with step
+            Given a step
+        '''.strip())
+        list(events) |should| each_be_equal_to([
+            ('start_parse', ('<string>',), 0),
+            ('start_feature', ('iterate events',), 1),
+            ('tags', ('tag',), 2),
+            ('start_scenario', ('with step',), 3),
+            ('start_step', ('Given', 'a step'), 4),
+            ('finish_step', (), 5),
+            ('finish_scenario', (), 5),
+            ('finish_feature', (), 5),
+            ('finish_parse', (), 5),
+        ])
+    
+    def test_iterates_events_lazily(self):
+        handler = mock.Mock()
+        events = Parser(handler).iter_events('''
+        Feature: stop early
+          Scenario: never reached
+        invalid
+        '''.strip())
+        [event for event, args, line_no in itertools.islice(events, 2)] |should| each_be_equal_to([
+            'start_parse', 'start_feature',
+        ])
+        handler.method_calls |should| be_equal_to([])
+    
+    def test_parses_encoded_buffers_like_text(self):
+        for key, test in six.iteritems(test_data['callbacks']):
+            input = six.text_type(test['input']).strip()
+            text_handler, bytes_handler = mock.Mock(), mock.Mock()
+            try:
+                Parser(text_handler).parse(input)
+            except ParseError:
+                text_handler.parse_error()
+            try:
+                Parser(bytes_handler).parse_buffer(input.encode('utf-8'), '<string>')
+            except ParseError:
+                bytes_handler.parse_error()
+            bytes_handler.method_calls |should| each_be_equal_to(text_handler.method_calls)
+    
+    def test_passes_on_blocks_like_single_lines(self):
+        for key, test in six.iteritems(test_data['callbacks']):
+            input = six.text_type(test['input']).strip()
+            for parse in (Parser.parse, Parser.parse_buffer):
+                if parse is Parser.parse_buffer:
+                    input = input.encode('utf-8')
+                line_handler, block_handler = mock.Mock(), mock.Mock()
+                try:
+                    parse(Parser(line_handler), input)
+                except ParseError:
+                    line_handler.parse_error()
+                try:
+                    parse(Parser(BlockExpander(block_handler), blocks=True), input)
+                except ParseError:
+                    block_handler.parse_error()
+                block_handler.method_calls |should| each_be_equal_to(line_handler.method_calls)
+    
+    def test_passes_on_hash_rows_and_multiline_as_blocks(self):
+        handler = mock.Mock()
+        parser = Parser(handler, blocks=True)
+        parser.parse('''
+        Feature: blocks
+          Scenario: with hash and multiline
+            Given a hash
+              | key   |
+              | one   |
+              | two   |
+            And a multiline
+              """
+              first
+              second
+              """
+        '''.strip())
+        handler.hash_data_block.assert_called_once_with([('one',), ('two',)])
+        handler.data_block.assert_called_once_with(['first\n', 'second\n'])
+        handler.hash_data.called |should| be(False)
+    
+    def test_can_parse_memory_mapped_files(self):
+        handler = mock.Mock()
+        with tempfile.NamedTemporaryFile(suffix='.feature', delete=False) as stream:
+            stream.write('''
+            @wünsche
+            Feature: Fürwahr
+              Scenario: with hash
+                Given a hash
+                  | ä | ö |
+            '''.strip().replace('\n', '\r\n').encode('utf-8'))
+        try:
+            Parser(handler).parse_file(stream.name)
+        finally:
+            os.remove(stream.name)
+        handler.method_calls |should| each_be_equal_to([
+            ('start_parse', (stream.name,), {}),
+            ('tags', ('wünsche',), {}),
+            ('start_feature', ('Fürwahr',), {}),
+            ('start_scenario', ('with hash',), {}),
+            ('start_step', ('Given', 'a hash'), {}),
+            ('start_hash', ('ä', 'ö'), {}),
+            ('finish_hash', (), {}),
+            ('finish_step', (), {}),
+            ('finish_scenario', (), {}),
+            ('finish_feature', (), {}),
+            ('finish_parse', (), {}),
+        ])
+    
+    def test_counts_lines_rows_and_callbacks_into_stats(self):
+        stats = ParseStats()
+        handler = mock.Mock()
+        parser = Parser(handler, stats=stats)
+        parser.parse('''
+        Feature: statistics
+          Scenario: with step
+        
+            Given a step
+        '''.strip())
+        stats.lines |should| be_equal_to(dict(start=1, feature=1, scenario=2))
+        stats.whitespace |should| be_equal_to(dict(scenario=1))
+        stats.attempts['scenario', 'step'] |should| be(2)
+        stats.misses['scenario', 'step'] |should| be(1)
+        stats.misses['scenario', 'comment'] |should| be(1)
+        stats.misses['feature', 'scenario'] |should| be(0)
+        stats.calls['start_step'] |should| be(1)
+        handler.start_step.assert_called_once_with('Given', 'a step')
+    
+    def test_can_dump_stats(self):
+        stats = ParseStats()
+        Parser(mock.Mock(), stats=stats).parse('Feature: statistics')
+        stream = StringIO()
+        Parser.dump_stats(stats, stream)
+        stream.getvalue() |should| include('start_feature')
+    
     @unittest.skip('pending review')
     def test_containes_unreachable_transitions(self):
         reachable_transitions, possible_transitions = Parser.parser_transitions()
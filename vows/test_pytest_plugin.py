@@ -0,0 +1,103 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_pytest_plugin.py --- pytest plugin vows
+#=============================================================================
+from __future__ import unicode_literals
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from should_dsl import should
+
+from wishes.compat import unittest
+
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+
+feature_source = '''\
+@feature
+Feature: collected
+  @smoke
+  Scenario: passes
+    Given a step
+  Scenario: fails
+    Given a failing step
+  Scenario: pending
+    Given an undefined step
+  Scenario Outline: row <n>
+    Given a step
+  @slow
+  Examples: rows
+    | n |
+    | 1 |
+    | 2 |
+'''
+
+conftest_source = '''\
+from wishes.feature import step
+
+@step('^Given a step$')
+def a_step(step):
+    pass
+
+@step('a failing step')
+def a_failing_step(step):
+    assert False
+'''
+
+@unittest.skipIf(pytest is None or int(pytest.__version__.split('.')[0]) < 7, 'pytest 7 not available')
+class PytestPluginVows(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name, source in [('collected.feature', feature_source), ('conftest.py', conftest_source)]:
+            with open(os.path.join(self.directory, name), 'wb') as stream:
+                stream.write(source.encode('utf-8'))
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def pytest(self, *args):
+        return self.run_pytest('-p', 'wishes.pytest_plugin', *args)
+    
+    def run_pytest(self, *args):
+        env = dict(os.environ)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [root, env.get('PYTHONPATH')]))
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'pytest', '-p', 'no:cacheprovider'] + list(args),
+            cwd=self.directory, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        )
+        output = process.communicate()[0].decode('utf-8')
+        return [line for line in output.splitlines() if line]
+    
+    def test_collects_one_item_per_scenario_and_example(self):
+        self.pytest('--collect-only', '-q')[:5] |should| each_be_equal_to([
+            'collected.feature::test_Scenario_fails',
+            'collected.feature::test_Scenario_passes',
+            'collected.feature::test_Scenario_pending',
+            'collected.feature::test_Scenario_row_1_1_Example_rows',
+            'collected.feature::test_Scenario_row_2_2_Example_rows',
+        ])
+    
+    def test_runs_items(self):
+        self.pytest('-q')[-1] |should| start_with('1 failed, 3 passed, 1 skipped')
+    
+    def test_marks_items_with_tags(self):
+        self.pytest('-q', '-m', 'slow and feature')[-1] |should| start_with('2 passed, 3 deselected')
+    
+    def test_is_only_used_when_asked_for(self):
+        self.run_pytest('--collect-only', '-q')[-1] |should| start_with('no tests collected')
+    
+    def test_selects_items_by_keyword(self):
+        self.pytest('-q', '-k', 'passes')[-1] |should| start_with('1 passed, 4 deselected')
+
+#.............................................................................
+#   test_pytest_plugin.py
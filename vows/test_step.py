@@ -72,6 +72,15 @@ class StepVows(unittest.TestCase):
             pass
         step_ = Step('Given', 'a MixeD case Definition')
         step_ |should| be_defined
+    
+    def test_can_be_defined_by_expression(self):
+        @step('there are {int} steps', expression=True)
+        def there_are_steps(step, count):
+            my_world.count = count
+        step_ = Step('Given', 'there are 12 steps')
+        my_world = World()
+        step_.run()
+        my_world.count |should| be(12)
 
 
 class HashesVows(unittest.TestCase):
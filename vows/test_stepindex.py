@@ -0,0 +1,182 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_stepindex.py --- Step definition index vows
+#=============================================================================
+from __future__ import unicode_literals
+
+import re
+
+import mock
+from should_dsl import should
+
+from wishes.compat import unittest
+from wishes.feature import ExpressionStepDefinition, StepDefinition, StepDefinitionError
+from wishes.stepindex import StepCache, StepIndex, required_literal
+
+
+def literal(pattern):
+    return required_literal(re.compile(pattern, re.IGNORECASE))
+
+
+class RequiredLiteralVows(unittest.TestCase):
+    
+    def test_is_the_longest_run_of_literals(self):
+        literal('a (.*) with (?:x|y)+ end') |should| be_equal_to(' with ')
+    
+    def test_is_lowercased(self):
+        literal('^there IS a step$') |should| be_equal_to('there is a step')
+    
+    def test_is_taken_from_groups(self):
+        literal('a (big step)') |should| be_equal_to('big step')
+    
+    def test_is_taken_from_required_repeats(self):
+        literal('(?:foobar)+ x') |should| be_equal_to('foobar')
+    
+    def test_skips_optional_parts(self):
+        literal('a(?: really big)? step') |should| be_equal_to(' step')
+        literal('(really big|small) s') |should| be(None)
+    
+    def test_stops_at_non_ascii_literals(self):
+        literal('straßenbahn') |should| be_equal_to('enbahn')
+    
+    def test_is_none_if_too_short(self):
+        literal('a (.*)') |should| be(None)
+
+
+class StepIndexVows(unittest.TestCase):
+    
+    patterns = [
+        'there is a step', '^given a (.*) step$', 'a (.*) step', 'STEP', '(.*)',
+        'an? (?:big|small) step', 'when I (\\d+) times', 'two words', 'ab+c',
+        '(?i)Case', 'ſtep', 'k step', 'steps?$',
+    ]
+    texts = [
+        'Given there is a step', 'Given a big step', 'Given an small step', 'When I 12 times',
+        'Then two words', 'Given abbbc', 'Given a CASE', 'Given ſtep', 'Given a Kelvin step', 'Given a K step',
+        'Given steps', 'Then nothing', '',
+    ]
+    
+    def setUp(self):
+        StepDefinition.clear()
+    
+    def linear(self, s):
+        return [sd for sd in StepDefinition.step_definitions if sd.match(s)]
+    
+    def test_finds_the_same_definitions_as_searching_all(self):
+        for n, pattern in enumerate(self.patterns):
+            StepDefinition(pattern, None)
+        index = StepIndex(StepDefinition.step_definitions)
+        for text in self.texts:
+            [sd for sd in index.candidates(text) if sd.match(text)] |should| be_equal_to(self.linear(text))
+    
+    def test_keeps_definitions_in_order(self):
+        for pattern in self.patterns:
+            StepDefinition(pattern, None)
+        index = StepIndex(StepDefinition.step_definitions)
+        candidates = index.candidates('Given a big step')
+        candidates |should| be_equal_to(sorted(candidates, key=StepDefinition.step_definitions.index))
+    
+    def test_leaves_out_definitions_without_their_literal(self):
+        first = StepDefinition('there is a step', None)
+        second = StepDefinition('two words', None)
+        StepIndex(StepDefinition.step_definitions).candidates('Given two words') |should| be_equal_to([second])
+    
+    def test_looks_up_literal_expressions(self):
+        StepDefinition('there is a step', None)
+        literal = ExpressionStepDefinition('two  Words', None)
+        ExpressionStepDefinition('{int} steps', None)
+        index = StepIndex(StepDefinition.step_definitions)
+        list(index.literals) |should| be_equal_to(['two words'])
+        index.candidates('Given TWO words') |should| be_equal_to([literal])
+        index.candidates('Given two words too') |should| be_equal_to([])
+    
+    def test_finds_the_same_expressions_as_searching_all(self):
+        for expression in ('two words', 'Two {word}', '{word} words', 'two word(s)', 'ſtep', 'a step'):
+            ExpressionStepDefinition(expression, None)
+        StepDefinition('two', None)
+        index = StepIndex(StepDefinition.step_definitions)
+        for text in ('Given two words', 'Then  two   WORDS ', 'Given two word', 'Given step',
+                'Given a ſtep', 'Given a Kelvin step', 'Given two words too', 'Given', ''):
+            [sd for sd in index.candidates(text) if sd.match(text)] |should| be_equal_to(self.linear(text))
+    
+    def test_is_updated_when_definitions_are_added(self):
+        StepDefinition('there is a step', None)
+        StepDefinition.get_step_definition('Given', 'two words') |should| be_equal_to((None, None))
+        second = StepDefinition('two words', None)
+        StepDefinition.get_step_definition('Given', 'two words')[0] |should| be(second)
+    
+    def test_is_rebuilt_when_definitions_are_cleared(self):
+        StepDefinition('two words', None)
+        StepDefinition.get_step_definition('Given', 'two words')
+        StepDefinition.clear()
+        StepDefinition.get_step_definition('Given', 'two words') |should| be_equal_to((None, None))
+    
+    def test_is_rebuilt_when_definitions_are_replaced(self):
+        StepDefinition('two words', None)
+        StepDefinition.get_step_definition('Given', 'two words')
+        StepDefinition.step_definitions = []
+        StepDefinition.get_step_definition('Given', 'two words') |should| be_equal_to((None, None))
+    
+    def test_keeps_ambiguous_matches(self):
+        StepDefinition('a (.*) step', None)
+        StepDefinition('a big step', None)
+        (lambda: StepDefinition.get_step_definition('Given', 'a big step')) |should| throw(StepDefinitionError)
+
+
+class StepCacheVows(unittest.TestCase):
+    
+    def setUp(self):
+        StepDefinition.clear()
+        StepDefinition.cache.clear()
+    
+    def test_remembers_looked_up_steps(self):
+        definition = StepDefinition('two (words)', None)
+        first = StepDefinition.get_step_definition('Given', 'two words')
+        with mock.patch.object(StepDefinition, 'get_step_definitions') as get_step_definitions:
+            StepDefinition.get_step_definition('Given', 'two words') |should| be(first)
+        get_step_definitions.called |should| be(False)
+        first[0] |should| be(definition)
+        first[1].groups() |should| be_equal_to(('words',))
+    
+    def test_remembers_undefined_steps(self):
+        StepDefinition.get_step_definition('Given', 'two words')
+        StepDefinition.get_step_definition('Given', 'two words') |should| be_equal_to((None, None))
+        StepDefinition.cache.stats() |should| be_equal_to(dict(hits=1, misses=1, size=1))
+    
+    def test_does_not_remember_ambiguous_steps(self):
+        StepDefinition('a (.*) step', None)
+        StepDefinition('a big step', None)
+        for n in range(2):
+            (lambda: StepDefinition.get_step_definition('Given', 'a big step')) |should| throw(StepDefinitionError)
+        StepDefinition.cache.stats() |should| be_equal_to(dict(hits=0, misses=2, size=0))
+    
+    def test_is_cleared_when_definitions_are_added(self):
+        StepDefinition.get_step_definition('Given', 'two words')
+        definition = StepDefinition('two words', None)
+        StepDefinition.get_step_definition('Given', 'two words')[0] |should| be(definition)
+    
+    def test_is_cleared_when_definitions_are_cleared(self):
+        StepDefinition('two words', None)
+        StepDefinition.get_step_definition('Given', 'two words')
+        StepDefinition.clear()
+        StepDefinition.get_step_definition('Given', 'two words') |should| be_equal_to((None, None))
+    
+    def test_is_cleared_when_definitions_are_replaced(self):
+        StepDefinition('two words', None)
+        StepDefinition.get_step_definition('Given', 'two words')
+        StepDefinition.step_definitions = []
+        StepDefinition.get_step_definition('Given', 'two words') |should| be_equal_to((None, None))
+    
+    def test_drops_least_recently_used_steps(self):
+        cache = StepCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        list(cache.entries) |should| be_equal_to(['a', 'c'])
+        cache.get('b') |should| be(None)
+        cache.stats() |should| be_equal_to(dict(hits=1, misses=1, size=2))
+
+#.............................................................................
+#   test_stepindex.py
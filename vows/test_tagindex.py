@@ -0,0 +1,113 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_tagindex.py --- Tag index vows
+#=============================================================================
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+
+import mock
+from should_dsl import should
+
+from wishes import loader
+from wishes.compat import unittest
+from wishes.tagindex import TagIndex, index_features, make_bitset
+
+
+sources = {
+    'a.feature': '''\
+@feature
+Feature: a
+  @background
+  Background:
+    Given a background
+  @smoke
+  Scenario: one
+    Given a step
+  @slow
+  Scenario Outline: two
+    Given a <value>
+  @smoke
+  Examples: smoke
+    | value |
+    | 1     |
+  Examples: other
+    | value |
+    | 2     |
+''',
+    'b.feature': '''\
+Feature: b
+  @slow @smoke
+  Scenario: three
+    Given a step
+''',
+}
+
+
+class TagIndexVows(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name, source in sources.items():
+            self.write(name, source)
+        self.index_path = os.path.join(self.directory, 'cache', 'tags.json')
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def write(self, name, source):
+        with open(os.path.join(self.directory, name), 'wb') as stream:
+            stream.write(source.encode('utf-8'))
+    
+    def select(self, index, expression):
+        return [(os.path.basename(path), method, line) for path, method, line in index.select(expression)]
+    
+    def test_selects_tests_with_inherited_tags(self):
+        index = index_features(self.directory, self.index_path)
+        self.select(index, '@smoke') |should| each_be_equal_to([
+            ('a.feature', 'test_Scenario_one', 7),
+            ('a.feature', 'test_Scenario_two_1_Example_smoke', 13),
+            ('b.feature', 'test_Scenario_three', 3),
+        ])
+        self.select(index, '@background and @slow and not @smoke') |should| each_be_equal_to([
+            ('a.feature', 'test_Scenario_two_1_Example_other', 16),
+        ])
+        self.select(index, '@feature') |should| have(3).items
+        self.select(index, '@unknown') |should| be_equal_to([])
+    
+    def test_loads_selected_tests(self):
+        index = index_features(self.directory, self.index_path)
+        suite = index.load_tests('@slow and @smoke')
+        [test._testMethodName for feature in suite for test in feature] |should| each_be_equal_to([
+            'test_Scenario_two_1_Example_smoke', 'test_Scenario_three',
+        ])
+    
+    def test_is_stored_and_reloaded(self):
+        index = index_features(self.directory, self.index_path)
+        reloaded = TagIndex.load(self.index_path)
+        reloaded.select('@slow') |should| each_be_equal_to(index.select('@slow'))
+    
+    def test_updates_only_changed_files(self):
+        index_features(self.directory, self.index_path)
+        self.write('b.feature', sources['b.feature'].replace('@slow @smoke', '@wip') + ' ')
+        with mock.patch.object(loader.defaultLoader, 'parse_feature_file',
+                wraps=loader.defaultLoader.parse_feature_file) as parse_feature_file:
+            index = index_features(self.directory, self.index_path)
+        [os.path.basename(call[0][0]) for call in parse_feature_file.call_args_list] |should| each_be_equal_to(['b.feature'])
+        self.select(index, '@wip') |should| each_be_equal_to([('b.feature', 'test_Scenario_three', 3)])
+    
+    def test_forgets_removed_files(self):
+        index_features(self.directory, self.index_path)
+        os.remove(os.path.join(self.directory, 'b.feature'))
+        index = index_features(self.directory, self.index_path)
+        index.paths('@smoke') |should| each_be_equal_to([os.path.join(self.directory, 'a.feature')])
+    
+    def test_makes_bitsets(self):
+        make_bitset([0, 3, 9], 10) |should| be_equal_to(0b1000001001)
+        make_bitset([], 0) |should| be(0)
+
+#.............................................................................
+#   test_tagindex.py
@@ -0,0 +1,55 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   test_tags.py --- Tag expression vows
+#=============================================================================
+from __future__ import unicode_literals
+
+from functools import partial
+
+from should_dsl import should
+
+from wishes.compat import unittest
+from wishes.tags import TagExpression, TagExpressionError, tag_expression
+
+
+class TagExpressionVows(unittest.TestCase):
+    
+    def test_matches_single_tag(self):
+        expression = TagExpression('@smoke')
+        expression({'smoke', 'slow'}) |should| be(True)
+        expression({'slow'}) |should| be(False)
+    
+    def test_accepts_tags_without_at_sign(self):
+        TagExpression('smoke')({'smoke'}) |should| be(True)
+    
+    def test_combines_tags_with_and_or_not(self):
+        expression = TagExpression('@smoke and not @slow or @wip')
+        expression({'smoke'}) |should| be(True)
+        expression({'smoke', 'slow'}) |should| be(False)
+        expression({'slow', 'wip'}) |should| be(True)
+    
+    def test_groups_with_parentheses(self):
+        expression = TagExpression('@smoke and not (@slow or @wip)')
+        expression({'smoke', 'wip'}) |should| be(False)
+        expression({'smoke'}) |should| be(True)
+    
+    def test_knows_its_tags(self):
+        expression = TagExpression('@a and (b or not @c)')
+        sorted(expression.tags) |should| each_be_equal_to(['a', 'b', 'c'])
+        expression.uses_not |should| be(True)
+        TagExpression('@a or @b').uses_not |should| be(False)
+    
+    def test_rejects_malformed_expressions(self):
+        for text in ['', '@a and', '(@a or @b', '@a @b', 'or @a', '@a)']:
+            partial(TagExpression, text) |should| throw(TagExpressionError)
+    
+    def test_makes_expression_from_list_of_tags(self):
+        expression = tag_expression(['smoke', '@wip'])
+        expression({'wip'}) |should| be(True)
+        expression({'slow'}) |should| be(False)
+        tag_expression(None) |should| be(None)
+        tag_expression(expression) |should| be(expression)
+
+#.............................................................................
+#   test_tags.py
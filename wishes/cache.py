@@ -0,0 +1,72 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   cache.py --- On-disk cache of parsed features
+#=============================================================================
+from __future__ import unicode_literals
+
+import hashlib
+import pickle
+import os
+import sys
+import tempfile
+
+from . import grammar
+
+
+replace = getattr(os, 'replace', os.rename)
+
+
+class ParseCache(object):
+    """FeatureNodes of feature files, stored in a cache directory.
+    
+    There is one entry per feature path and encoding, holding the node
+    together with the hash of the content it was parsed from. Entries are
+    pickled, and only used by the Python version and grammar that wrote
+    them; both are part of the stamp of each entry.
+    """
+    version = 2
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.stamp = hashlib.sha1(repr((
+            self.version, tuple(sys.version_info[:2]),
+            sorted((name, sorted(section.items())) for name, section in grammar.config.items()),
+        )).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def digest(source):
+        return hashlib.sha1(source).hexdigest()
+    
+    def entry_path(self, path, encoding='utf-8'):
+        key = hashlib.sha1(('%s\0%s' % (os.path.abspath(path), encoding.lower())).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key + '.node')
+    
+    def load(self, path, digest, encoding='utf-8'):
+        """Return the cached node of path, None if the content changed."""
+        try:
+            with open(self.entry_path(path, encoding), 'rb') as stream:
+                stamp, cached_digest, feature = pickle.load(stream)
+        except Exception:
+            return None
+        if stamp != self.stamp or cached_digest != digest:
+            return None
+        return feature
+    
+    def save(self, path, digest, feature, encoding='utf-8'):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                pickle.dump((self.stamp, digest, feature), stream, pickle.HIGHEST_PROTOCOL)
+            replace(temp_path, self.entry_path(path, encoding))
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+#.............................................................................
+#   cache.py
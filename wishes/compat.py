@@ -4,6 +4,7 @@
 #   compat.py --- Compatibility for Python 2.6
 #=============================================================================
 
+import os
 import sys
 if sys.version_info[:2] < (2, 7):
     try:
@@ -33,6 +34,27 @@ except ImportError:
             indices[i:] = [indices[i] + 1] * (r - i)
             yield tuple(pool[i] for i in indices)
 
+try:
+    from os import scandir
+except ImportError:
+    class DirEntry(object):
+        def __init__(self, directory, name):
+            self.name = name
+            self.path = os.path.join(directory, name)
+        
+        def is_dir(self, follow_symlinks=True):
+            if not follow_symlinks and os.path.islink(self.path):
+                return False
+            return os.path.isdir(self.path)
+        
+        def is_file(self, follow_symlinks=True):
+            if not follow_symlinks and os.path.islink(self.path):
+                return False
+            return os.path.isfile(self.path)
+    
+    def scandir(path='.'):
+        return (DirEntry(path, name) for name in os.listdir(path))
+
 #.............................................................................
 #   compat.py
 
@@ -0,0 +1,284 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   compiler.py --- Compile feature files into Python test modules
+#
+#  Generated modules hold a concrete TestCase class for their feature, with
+#  outlines expanded and steps bound to their definitions at build time:
+#
+#      python -m wishes.compiler -s myproject.steps -o tests features/
+#
+#  Modules are only rebuilt when the hash of their feature file changed.
+#=============================================================================
+from __future__ import print_function, unicode_literals
+
+import argparse
+import hashlib
+import importlib
+import os
+import pprint
+import re
+import sys
+import warnings
+
+import six
+
+from .compat import unittest
+from .feature import FeatureTest, OutlineExample, Scenario, Step, StepDefinition, Hashes, add_tags
+
+
+class StaleModuleWarning(UserWarning):
+    pass
+
+
+source_hash_re = re.compile(r"^source_hash = '([0-9a-f]+)'$", re.MULTILINE)
+
+def source_digest(path):
+    with open(path, 'rb') as stream:
+        return hashlib.sha1(stream.read()).hexdigest()
+
+def module_path(path, target_dir=None, base_dir=None):
+    """Return the path of the module generated from the feature file at path.
+    
+    In a target_dir, the directories of path below base_dir are part of
+    the module name, so features of the same name in different
+    directories get different modules.
+    """
+    from .loader import slugify
+    directory, name = os.path.split(path)
+    parts = [os.path.splitext(name)[0]]
+    if target_dir is not None and base_dir is not None:
+        relative = os.path.relpath(os.path.abspath(directory), os.path.abspath(base_dir))
+        if relative != os.curdir:
+            parts[:0] = relative.split(os.sep)
+    name = 'test_%s.py' % '_'.join(slugify(part).lower() for part in parts)
+    return os.path.join(directory if target_dir is None else target_dir, name)
+
+def common_directory(paths):
+    """Return the deepest directory containing all of paths."""
+    parts = [os.path.dirname(os.path.abspath(path)).split(os.sep) for path in paths]
+    return os.sep.join(os.path.commonprefix(parts)) or os.sep
+
+def source_reference(path, target):
+    """Return the path of the feature file at path relative to the module at target."""
+    relative = os.path.relpath(os.path.abspath(path), os.path.dirname(os.path.abspath(target)))
+    return relative.replace(os.sep, '/')
+
+def is_stale(path, target):
+    """Tell if the module at target is missing, or not built from the feature at path as it is now."""
+    try:
+        with open(target) as stream:
+            source = stream.read()
+    except (IOError, OSError):
+        return True
+    match = source_hash_re.search(source)
+    if match is None or match.group(1) != source_digest(path):
+        return True
+    return 'source_path = %s\n' % literal(source_reference(path, target)) not in source
+
+def check_source(module_file, source_path, source_hash):
+    """Warn if the feature file of a generated module changed since its build."""
+    path = os.path.join(os.path.dirname(os.path.abspath(module_file)), source_path)
+    try:
+        digest = source_digest(path)
+    except (IOError, OSError):
+        return
+    if digest != source_hash:
+        warnings.warn('%s changed since %s was generated' % (path, module_file), StaleModuleWarning, 2)
+
+def compile_feature(path, target_dir=None, step_modules=(), encoding='utf-8', base_dir=None):
+    """Write the test module of the feature file at path, returning its path.
+    
+    Step modules are imported first, so steps can be bound to their
+    definitions. Steps whose definition is not a module level function,
+    or has no match yet, are matched when the module is imported.
+    """
+    from .loader import Loader
+    for name in step_modules:
+        importlib.import_module(name)
+    target = module_path(path, target_dir, base_dir)
+    digest = source_digest(path)
+    loader = Loader()
+    node = loader.parse_feature_file(path, encoding)
+    suite = loader.build_suite(node)
+    Feature = None if suite is None else type(six.next(iter(suite)))
+    tags = None if add_tags is None or node.tags is None else sorted(node.tags)
+    backgrounds = []
+    scenarios = []
+    if Feature is not None:
+        for method in sorted(Feature.scenarios):
+            scenario = Feature.scenarios[method]
+            if isinstance(scenario, OutlineExample):
+                scenario = scenario.expand()
+            scenarios.append((method, dump_scenario(scenario, backgrounds)))
+    with open(target, 'wb') as stream:
+        stream.write(dump_module(
+            target, source_reference(path, target), digest, list(step_modules), Feature, tags,
+            backgrounds, scenarios,
+        ).encode('utf-8'))
+    return target
+
+def compile_features(paths, target_dir=None, step_modules=(), encoding='utf-8', force=False):
+    """Compile the stale ones of feature files, yielding their module paths.
+    
+    In a target_dir, modules are named by the path of their feature below
+    the common directory of paths. Raises ValueError if two features
+    would still get the same module.
+    """
+    paths = list(paths)
+    base_dir = common_directory(paths) if target_dir is not None and paths else None
+    targets = dict()
+    for path in paths:
+        target = module_path(path, target_dir, base_dir)
+        if target in targets:
+            raise ValueError('%s and %s would both be compiled into %s' % (targets[target], path, target))
+        targets[target] = path
+    for path in paths:
+        target = module_path(path, target_dir, base_dir)
+        if force or is_stale(path, target):
+            yield compile_feature(path, target_dir, step_modules, encoding, base_dir)
+
+def dump_scenario(scenario, backgrounds):
+    background = None
+    if scenario.background is not None:
+        data = dump_scenario(scenario.background, backgrounds)
+        if data not in backgrounds:
+            backgrounds.append(data)
+        background = backgrounds.index(data)
+    return dict(
+        title=scenario.title,
+        tags=None if scenario.tags is None else sorted(scenario.tags),
+        background=background,
+        steps=[dump_step(step) for step in scenario.steps],
+    )
+
+def dump_step(step):
+    return (
+        step.kind, step.text, list(step.multilines),
+        list(step.hashes.keys), [list(row) for row in step.hashes.values],
+        dump_binding(step),
+    )
+
+def dump_binding(step):
+    if step.definition is None:
+        return None
+    function = step.definition.definition
+    module = sys.modules.get(getattr(function, '__module__', None))
+    if getattr(module, getattr(function, '__name__', ''), None) is not function:
+        return None
+    return (function.__module__, function.__name__, step.definition.pattern.pattern,
+        list(step.match.groups()))
+
+literal = pprint.pformat
+
+def dump_module(target, source_path, digest, step_modules, Feature, tags, backgrounds, scenarios):
+    name = os.path.basename(target)
+    lines = [
+        '# -*- coding:utf-8 -*-',
+        '# Autogenerated from %s by wishes.compiler, do not edit.' % source_path,
+        '#' + '=' * 77,
+        '#   %s --- %s' % (name, 'no feature' if Feature is None else 'Feature: %s' % Feature.title),
+        '#' + '=' * 77,
+        'from __future__ import unicode_literals',
+        '',
+        'from wishes.compiler import check_source, make_test_case',
+        '',
+        '',
+        "source_path = %s" % literal(source_path),
+        "source_hash = '%s'" % digest,
+        'step_modules = %s' % literal(step_modules),
+        '',
+        'check_source(__file__, source_path, source_hash)',
+    ]
+    if Feature is not None:
+        lines += [
+            '',
+            'backgrounds = %s' % literal(backgrounds),
+            '',
+            'scenarios = %s' % literal(scenarios),
+            '',
+            '%s = make_test_case(%s, %s, %s, %s, scenarios, backgrounds, step_modules)' % (
+                Feature.__name__, literal(Feature.__name__), literal(Feature.title),
+                literal(getattr(Feature, 'description', None)), literal(tags),
+            ),
+        ]
+    lines += [
+        '',
+        '#' + '.' * 77,
+        '#   %s' % name,
+        '',
+    ]
+    return '\n'.join(lines)
+
+def make_test_case(name, title, description, tags, scenarios, backgrounds=(), step_modules=(),
+        test_case_class=unittest.TestCase):
+    """Return the TestCase class of a generated module."""
+    for module in step_modules:
+        importlib.import_module(module)
+    definitions = dict(
+        ((step_definition.definition, step_definition.pattern.pattern), step_definition)
+        for step_definition in StepDefinition.iter_all()
+    )
+    class Feature(FeatureTest, test_case_class):
+        pass
+    Feature.__name__ = str(name)
+    Feature.title = title
+    if description is not None:
+        Feature.description = description
+    if add_tags is not None and tags is not None:
+        add_tags(Feature, set(tags))
+    backgrounds = [load_scenario(data, None, definitions) for data in backgrounds]
+    for method, data in scenarios:
+        Feature.add_scenario(str(method), load_scenario(data, backgrounds, definitions))
+    return Feature
+
+def load_scenario(data, backgrounds, definitions):
+    background = None if data['background'] is None else backgrounds[data['background']]
+    tags = None if data['tags'] is None else set(data['tags'])
+    scenario = Scenario(data['title'], background=background, tags=tags)
+    scenario.steps = [load_step(step, definitions) for step in data['steps']]
+    return scenario
+
+def bind_step(step_definition, kind, text, groups):
+    """Return the binding of a step to step_definition, matching it only against that.
+    
+    Returns None if the match differs from the one at build time, so the
+    step is matched against all definitions as usual.
+    """
+    match = step_definition.match(' '.join((kind, text)))
+    if not match or list(match.groups()) != list(groups):
+        return None
+    return step_definition, match
+
+def load_step(data, definitions):
+    kind, text, multilines, keys, rows, binding = data
+    if binding is not None:
+        module, name, pattern, groups = binding
+        function = getattr(sys.modules.get(module), name, None)
+        step_definition = definitions.get((function, pattern))
+        binding = None if step_definition is None else bind_step(step_definition, kind, text, groups)
+    return Step(kind, text, multilines=multilines, hashes=Hashes(keys, rows), binding=binding)
+
+def main(argv=None):
+    from .loader import find_features
+    parser = argparse.ArgumentParser(prog='python -m wishes.compiler',
+        description='Compile feature files into Python test modules.')
+    parser.add_argument('paths', nargs='+', help='feature files or directories to search')
+    parser.add_argument('-o', '--target-dir', help='directory of the generated modules')
+    parser.add_argument('-s', '--steps', action='append', default=[], help='step definitions module')
+    parser.add_argument('-e', '--encoding', default='utf-8')
+    parser.add_argument('-f', '--force', action='store_true', help='rebuild all modules')
+    args = parser.parse_args(argv)
+    paths = []
+    for path in args.paths:
+        paths.extend(find_features(path) if os.path.isdir(path) else [path])
+    if args.target_dir is not None and not os.path.isdir(args.target_dir):
+        os.makedirs(args.target_dir)
+    for target in compile_features(paths, args.target_dir, args.steps, args.encoding, args.force):
+        print(target)
+
+if __name__ == '__main__':
+    main()
+
+#.............................................................................
+#   compiler.py
@@ -0,0 +1,199 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   examples.py --- External sources of outline examples
+#
+#  An Examples block takes its rows from a CSV or JSON lines file, or from a
+#  registered generator, if its title ends with a reference to the source in
+#  brackets:
+#
+#      Examples: users [from data/users.csv]
+#      Examples: [from users.jsonl]
+#      Examples: [from big_users()]
+#
+#  A table below such a block only gives the keys to take from the source.
+#=============================================================================
+from __future__ import unicode_literals
+
+import codecs
+import collections
+import csv
+import importlib
+import io
+import json
+import os
+import re
+
+import six
+
+
+source_re = re.compile(r'\[from\s+(\S+\.(?:csv|jsonl)|[\w.]+\(\))\]\s*$', re.IGNORECASE)
+
+generators = dict()
+
+def examples_source(name):
+    """Register a generator function of example rows as source name.
+    
+    The generator may yield dicts, or sequences of values in the order of
+    the keys of the Examples table.
+    """
+    def register(function):
+        generators[name] = function
+        return function
+    return register
+
+def find_source(title, feature_path=None, encoding='utf-8'):
+    """Return the source referenced by an Examples title, or None."""
+    match = source_re.search(title or '')
+    if match is None:
+        return None
+    reference = match.group(1)
+    if reference.endswith('()'):
+        return GeneratorSource(reference[:-2])
+    directory = '' if feature_path is None else os.path.dirname(feature_path)
+    path = os.path.join(directory, reference)
+    if reference.lower().endswith('.csv'):
+        return CsvSource(path, encoding)
+    return JsonLinesSource(path, encoding)
+
+def to_text(value):
+    if isinstance(value, six.string_types):
+        return value
+    return json.dumps(value)
+
+
+class ExamplesSource(object):
+    """Rows of examples, read one at a time.
+    
+    Iterating yields a handle and the values of each row. Handles are
+    small, so an outline example keeps just its handle and reads its
+    values again when it is expanded.
+    """
+    keys = None
+    
+    def select(self, keys):
+        """Take only the values of keys, in their order."""
+        self.keys = tuple(keys)
+    
+    def values(self, record):
+        if isinstance(record, dict):
+            if self.keys is None:
+                self.keys = tuple(record)
+            return tuple(to_text(record.get(key, '')) for key in self.keys)
+        if self.keys is None:
+            raise ValueError('%r yields rows without keys, the examples need a table of keys' % self)
+        return tuple(to_text(value) for value in record)
+
+
+class FileSource(ExamplesSource):
+    
+    def __init__(self, path, encoding='utf-8'):
+        self.path = path
+        self.encoding = encoding
+    
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.path)
+    
+    def __iter__(self):
+        with open(self.path, 'rb') as stream:
+            for offset, record in self.iter_records(stream):
+                yield offset, self.values(record)
+    
+    def read(self, offset):
+        with open(self.path, 'rb') as stream:
+            stream.seek(offset)
+            for offset, record in self.iter_records(stream):
+                return self.values(record)
+
+
+class CsvSource(FileSource):
+    """Rows of a CSV file, the first one holding the keys."""
+    
+    def __init__(self, path, encoding='utf-8'):
+        super(CsvSource, self).__init__(path, encoding)
+        self.header = None
+    
+    def __iter__(self):
+        with open(self.path, 'rb') as stream:
+            records = self.iter_records(stream)
+            for offset, header in records:
+                self.header = header
+                break
+            if self.keys is None:
+                self.keys = tuple(self.header or ())
+            for offset, record in records:
+                yield offset, self.values(record)
+    
+    def read(self, offset):
+        if self.header is None:
+            for row in self:
+                break
+        return super(CsvSource, self).read(offset)
+    
+    def values(self, record):
+        return super(CsvSource, self).values(dict(zip(self.header, record)))
+    
+    def iter_records(self, stream):
+        offset = stream.tell()
+        lines = []
+        for line in iter(stream.readline, b''):
+            if not lines:
+                start = offset
+            offset += len(line)
+            lines.append(line)
+            data = b''.join(lines)
+            if data.count(b'"') % 2:
+                continue
+            lines = []
+            if data.strip():
+                yield start, self.parse(data)
+    
+    def parse(self, data):
+        if six.PY2:
+            return [cell.decode(self.encoding) for cell in next(csv.reader(io.BytesIO(data)))]
+        return next(csv.reader(io.StringIO(data.decode(self.encoding), newline='')))
+
+
+class JsonLinesSource(FileSource):
+    """Rows of a file with one JSON object on each line."""
+    
+    def iter_records(self, stream):
+        offset = stream.tell()
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        for line in iter(stream.readline, b''):
+            start, offset = offset, offset + len(line)
+            text = decoder.decode(line)
+            if text.strip():
+                yield start, json.loads(text, object_pairs_hook=collections.OrderedDict)
+
+
+class GeneratorSource(ExamplesSource):
+    """Rows of a generator function, registered or given by module path.
+    
+    Generators can't be read again from a position, so their rows are
+    their own handles.
+    """
+    
+    def __init__(self, name):
+        self.name = name
+        function = generators.get(name)
+        if function is None and '.' in name:
+            module, attribute = name.rsplit('.', 1)
+            function = getattr(importlib.import_module(module), attribute, None)
+        if function is None:
+            raise ValueError('unknown examples source %r' % name)
+        self.function = function
+    
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.name)
+    
+    def __iter__(self):
+        for record in self.function():
+            values = self.values(record)
+            yield values, values
+    
+    def read(self, values):
+        return values
+
+#.............................................................................
+#   examples.py
@@ -0,0 +1,151 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   expressions.py --- Cucumber expressions for step definitions
+#
+#  An expression is matched against the whole text of a step, ignoring its
+#  kind, case and the amount of whitespace between words:
+#
+#      I have {int} cucumber(s) in my belly/stomach
+#
+#  {name} is a parameter, whose value is converted by its type, (text) is
+#  optional and a/b are alternative words. \ escapes any of {}()/.
+#=============================================================================
+from __future__ import unicode_literals
+
+import re
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+class ParameterType(object):
+    """A named regular expression and the function converting its matches."""
+    
+    def __init__(self, name, regexp, transformer=None):
+        self.name = name
+        self.regexp = regexp
+        self.transformer = transformer
+        self.groups = re.compile(regexp).groups
+    
+    def transform(self, text):
+        return text if self.transformer is None else self.transformer(text)
+
+
+parameter_types = dict()
+expressions = dict()
+
+def define_parameter_type(name, regexp, transformer=None):
+    parameter_types[name] = ParameterType(name, regexp, transformer)
+    expressions.clear()
+
+def parameter_type(name, regexp):
+    """Register a function converting the text matching regexp as parameter type name."""
+    def register(function):
+        define_parameter_type(name, regexp, function)
+        return function
+    return register
+
+define_parameter_type('int', r'-?\d+', int)
+define_parameter_type('float', r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?', float)
+define_parameter_type('word', r'\S+')
+define_parameter_type('string', r'"[^"]*"|\'[^\']*\'', lambda text: text[1:-1])
+define_parameter_type('', r'.*')
+
+
+def compile_expression(text):
+    """Return the Expression of text, compiling it on first use."""
+    expression = expressions.get(text)
+    if expression is None:
+        expression = expressions[text] = Expression(text)
+    return expression
+
+
+class Expression(object):
+    """A Cucumber expression compiled into a regular expression.
+    
+    The regular expression matches the kind and text of a step joined by
+    a space. An expression without parameters, optional text or
+    alternatives has its lowercased words joined by single spaces as
+    literal.
+    """
+    token_re = re.compile(r'\\(.)|\{([^{}]*)\}|([()/])|([^\\{}()/]+)|(.)', re.DOTALL)
+    
+    def __init__(self, text):
+        self.text = text
+        self.parameters = []
+        self.words = []
+        self.is_literal = True
+        words = text.split()
+        if not words:
+            raise ExpressionError('empty expression')
+        body = r'\s+'.join(self.compile_word(word) for word in words)
+        self.regexp = r'\A\s*\S+\s+%s\s*\Z' % body
+        self.pattern = re.compile(self.regexp, re.IGNORECASE)
+        self.literal = ' '.join(self.words).lower() if self.is_literal else None
+    
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.text)
+    
+    def compile_word(self, word):
+        alternatives = [[]]
+        optional = None
+        plain = []
+        count = len(self.parameters)
+        for match in self.token_re.finditer(word):
+            escaped, name, special, text, brace = match.groups()
+            if brace is not None:
+                raise ExpressionError('unbalanced %r in expression %r' % (brace, self.text))
+            if special == '(':
+                if optional is not None:
+                    raise ExpressionError('nested optional text in expression %r' % self.text)
+                optional = []
+            elif special == ')':
+                if optional is None:
+                    raise ExpressionError('unbalanced ) in expression %r' % self.text)
+                alternatives[-1].append('(?:%s)?' % ''.join(optional))
+                optional = None
+                self.is_literal = False
+            elif special == '/':
+                if optional is not None:
+                    raise ExpressionError('alternative in optional text in expression %r' % self.text)
+                alternatives.append([])
+                self.is_literal = False
+            elif name is not None:
+                if optional is not None:
+                    raise ExpressionError('parameter in optional text in expression %r' % self.text)
+                alternatives[-1].append(self.compile_parameter(name.strip()))
+            else:
+                plain.append(escaped or text)
+                (alternatives[-1] if optional is None else optional).append(re.escape(escaped or text))
+        if optional is not None:
+            raise ExpressionError('unbalanced ( in expression %r' % self.text)
+        self.words.append(''.join(plain))
+        if len(alternatives) == 1:
+            return ''.join(alternatives[0])
+        if len(self.parameters) > count:
+            raise ExpressionError('parameter in alternative in expression %r' % self.text)
+        if not all(alternatives):
+            raise ExpressionError('empty alternative in expression %r' % self.text)
+        return '(?:%s)' % '|'.join(''.join(alternative) for alternative in alternatives)
+    
+    def compile_parameter(self, name):
+        parameter_type = parameter_types.get(name)
+        if parameter_type is None:
+            raise ExpressionError('unknown parameter type {%s} in expression %r' % (name, self.text))
+        self.parameters.append(parameter_type)
+        self.is_literal = False
+        return '(%s)' % parameter_type.regexp
+    
+    def convert(self, groups):
+        """Return the values of the parameters from the groups of a match."""
+        values = []
+        n = 0
+        for parameter_type in self.parameters:
+            values.append(parameter_type.transform(groups[n]))
+            n += 1 + parameter_type.groups
+        return values
+
+#.............................................................................
+#   expressions.py
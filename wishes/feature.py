@@ -5,12 +5,17 @@
 #=============================================================================
 from __future__ import unicode_literals
 
+import os
 import re
 import threading
 import inspect
 
 import six
 
+from .compat import unittest
+from .expressions import compile_expression
+from .stepindex import StepCache, update_index
+
 
 try:
     from autocheck.tags import add_tags, get_tags
@@ -27,11 +32,14 @@ class World(threading.local):
 class FeatureTest(object):
     scenarios = dict()
     _world = None
+    _scenario = None
     
     def __init__(self, *args, **kwargs):
         super(FeatureTest, self).__init__(*args, **kwargs)
-        if add_tags is not None and not self.is_empty and self.scenario.tags is not None:
-            add_tags(self, self.scenario.tags)
+        if add_tags is not None and not self.is_empty:
+            tags = self.scenarios[self._testMethodName].tags
+            if tags is not None:
+                add_tags(self, tags)
     
     def runTest(self):
         if self.is_empty:
@@ -47,7 +55,7 @@ class FeatureTest(object):
         if self.is_empty:
             return 'Feature: {0}'.format(self.title)
         else:
-            return 'Scenario: {0}'.format(self.scenario.title)
+            return 'Scenario: {0}'.format(self.scenarios[self._testMethodName].title)
     
     @property
     def world(self):
@@ -61,7 +69,12 @@ class FeatureTest(object):
     
     @property
     def scenario(self):
-        return self.scenarios[self._testMethodName]
+        scenario = self.scenarios[self._testMethodName]
+        if isinstance(scenario, OutlineExample):
+            if self._scenario is None:
+                self._scenario = scenario.expand()
+            return self._scenario
+        return scenario
     
     @property
     def is_scenario(self):
@@ -69,9 +82,21 @@ class FeatureTest(object):
     
     @classmethod
     def add_scenario(cls, methodName, scenario):
+        if 'scenarios' not in cls.__dict__:
+            cls.scenarios = dict()
         setattr(cls, methodName, cls.runTest)
         cls.scenarios[methodName] = scenario
     
+    @classmethod
+    def make_suite(cls):
+        """Return the suite of the feature's scenarios.
+        
+        The test cases are made from the scenario table of the class in
+        the order of unittest's loader, without searching the class for
+        test methods. A feature without scenarios has a single test.
+        """
+        return unittest.TestSuite([cls(name) for name in sorted(cls.scenarios) or ['runTest']])
+    
     def getsource(self):
         return self.shortDescription() if self.is_empty else self.scenario.getsource()
 
@@ -96,6 +121,9 @@ class Hashes(object):
     def add_row(self, row):
         self.values.append(row)
     
+    def add_rows(self, rows):
+        self.values.extend(rows)
+    
     def fix_keys_for_outline(self):
         self.keys = [self.fix_key_for_outline(key) for key in self.keys]
     
@@ -122,7 +150,49 @@ class Hashes(object):
             yield dict(zip(self.keys, row))
 
 
+class OutlineExample(object):
+    """One row of the examples of a Scenario Outline.
+    
+    The row is only expanded into a Scenario, with its steps filled from
+    the example, when its test runs. With an ExamplesSource, row is the
+    handle the source reads the values with.
+    """
+    __slots__ = ('scenario_class', 'outline', 'keys', 'row', 'example_tags', 'source')
+    
+    def __init__(self, scenario_class, outline, keys, row, tags=None, source=None):
+        self.scenario_class = scenario_class
+        self.outline = outline
+        self.keys = keys
+        self.row = row
+        self.example_tags = tags
+        self.source = source
+    
+    @property
+    def example(self):
+        if self.source is None:
+            return dict(zip(self.keys, self.row))
+        return dict(zip(self.keys, self.source.read(self.row)))
+    
+    @property
+    def title(self):
+        return fill_from_example(self.outline.title, self.example)
+    
+    @property
+    def tags(self):
+        if self.outline.tags is None:
+            return self.example_tags
+        elif self.example_tags is None:
+            return self.outline.tags
+        else:
+            return set(self.example_tags) | self.outline.tags
+    
+    def expand(self):
+        return self.scenario_class(outline=(self.outline, self.example), tags=self.example_tags)
+
+
 class Scenario(object):
+    registries = ()
+    deferred = False
     
     def __init__(self, title=None, background=None, outline=None, tags=None):
         self.background = background
@@ -153,6 +223,7 @@ class Scenario(object):
     def run(self, feature):
         if not self.steps:
             feature.skipTest('no steps defined')
+        self.bind_steps()
         if self.background is not None:
             self.background.run(feature)
         startStep = getattr(feature.result, 'startStep', None)
@@ -191,7 +262,16 @@ class Scenario(object):
                     stopStep(step)
     
     def add_step(self, kind, text, multilines=None, hashes=None):
-        self.steps.append(Step(kind, text, multilines=multilines, hashes=hashes))
+        self.steps.append(Step(kind, text, multilines=multilines, hashes=hashes,
+            registries=self.registries, deferred=self.deferred))
+    
+    def bind_steps(self):
+        """Match the steps not matched yet to their definitions."""
+        if self.background is not None:
+            self.background.bind_steps()
+        for step in self.steps:
+            if not step.is_bound:
+                step.bind()
     
     def create_steps_from_outline(self):
         self.steps = list(self.outline.create_steps_from_example(self.example))
@@ -219,7 +299,7 @@ class Scenario(object):
     @property
     def undefined_steps(self):
         return list(filter(lambda step: step.is_undefined, self.steps))
-
+    
     def getsourcebits(self):
         if self.background is not None:
             for bit in self.background.getsourcebits():
@@ -228,7 +308,7 @@ class Scenario(object):
         for step in self.steps:
             for bit in step.getsourcebits():
                 yield bit
-
+    
     def getsource(self):
         return u'\n'.join(self.getsourcebits()).encode('utf-8')
 
@@ -236,13 +316,36 @@ class Scenario(object):
 @six.python_2_unicode_compatible
 class Step(object):
     
-    def __init__(self, kind, text, multilines=None, hashes=None):
+    def __init__(self, kind, text, multilines=None, hashes=None, binding=None, registries=(),
+            deferred=False):
         self.kind = kind
         self.text = text
-        self.definition, self.match = StepDefinition.get_step_definition(kind, text)
+        self.registries = registries
+        self.deferred = deferred
+        if binding is not None:
+            self.definition, self.match = binding
+        elif not deferred:
+            self.bind()
         self.multilines = [] if multilines is None else multilines
         self.hashes = Hashes() if hashes is None else hashes
     
+    def __getattr__(self, name):
+        if name in ('definition', 'match') and 'kind' in self.__dict__:
+            self.bind()
+            return self.__dict__[name]
+        raise AttributeError(name)
+    
+    def bind(self):
+        """Match the step to its definition."""
+        if self.registries:
+            self.definition, self.match = StepDefinition.get_step_definition(self.kind, self.text, self.registries)
+        else:
+            self.definition, self.match = StepDefinition.get_step_definition(self.kind, self.text)
+    
+    @property
+    def is_bound(self):
+        return 'definition' in self.__dict__
+    
     def __str__(self):
         return ('%s %s' % (self.kind, self.text))
     
@@ -267,7 +370,8 @@ class Step(object):
     def fill_from_example(self, example):
         multilines = [fill_from_example(line, example) for line in self.multilines]
         return Step(self.kind, fill_from_example(self.text, example),
-            multilines=multilines, hashes=self.hashes.fill_from_example(example))
+            multilines=multilines, hashes=self.hashes.fill_from_example(example),
+            registries=self.registries, deferred=self.deferred)
     
     def getsourcebits(self):
         yield unicode(self)
@@ -282,12 +386,24 @@ class StepDefinitionError(Exception):
     pass
 
 class StepDefinition(object):
+    """A step definition, visible to all features unless given a registry.
+    
+    The class keeps the global step definitions. Steps are matched against
+    these and the definitions of the StepRegistry objects of their
+    feature.
+    """
     step_definitions = []
+    index = None
+    version = 0
+    cache = StepCache()
     
-    def __init__(self, pattern, definition):
+    def __init__(self, pattern, definition, registry=None):
         self.pattern = re.compile(pattern, re.IGNORECASE)
         self.definition = definition
-        self.add_step_definition(self)
+        if registry is None:
+            self.add_step_definition(self)
+        else:
+            registry.add_step_definition(self)
     
     def __repr__(self):
         return repr(self.pattern.pattern)
@@ -295,19 +411,35 @@ class StepDefinition(object):
     @classmethod
     def add_step_definition(cls, step_definition):
         cls.step_definitions.append(step_definition)
+        StepDefinition.version += 1
     
     @classmethod
-    def get_step_definitions(cls, kind, text):
+    def get_index(cls):
+        """Return the StepIndex of the step definitions, updating it as they change."""
+        index = cls.index = update_index(cls.index, cls.step_definitions)
+        return index
+    
+    @classmethod
+    def get_step_definitions(cls, kind, text, registries=()):
         s = ' '.join((kind, text))
-        for step_definition in cls.step_definitions:
+        for step_definition in cls.get_index().candidates(s):
             match = step_definition.match(s)
             if match:
                 yield step_definition, match
+        for registry in registries:
+            for step_definition, match in registry.get_step_definitions(s):
+                yield step_definition, match
     
     @classmethod
-    def get_step_definition(cls, kind, text):
-        step_definitions = list(cls.get_step_definitions(kind, text))
+    def get_step_definition(cls, kind, text, registries=()):
+        cls.cache.check(cls.version, cls.step_definitions)
+        key = (kind, text, tuple(registries))
+        found = cls.cache.get(key)
+        if found is not None:
+            return found
+        step_definitions = list(cls.get_step_definitions(kind, text, registries))
         if len(step_definitions) == 1:
+            cls.cache.put(key, step_definitions[0])
             return step_definitions[0]
         elif len(step_definitions) > 1:
             raise StepDefinitionError(
@@ -316,11 +448,25 @@ class StepDefinition(object):
                 [step_definition for step_definition, match in step_definitions]
             )
         else:
+            cls.cache.put(key, (None, None))
             return None, None
     
     @classmethod
     def clear(cls):
+        """Forget the global step definitions and all registries."""
         cls.step_definitions = []
+        cls.index = None
+        step_registries.clear()
+        StepDefinition.version += 1
+    
+    @classmethod
+    def iter_all(cls):
+        """Yield the global step definitions and those of all registries."""
+        for step_definition in cls.step_definitions:
+            yield step_definition
+        for registry in list(step_registries.values()):
+            for step_definition in registry.step_definitions:
+                yield step_definition
     
     def match(self, s):
         return self.pattern.search(s)
@@ -331,13 +477,120 @@ class StepDefinition(object):
     def getsourcebits(self):
         return self.pattern.pattern, inspect.getsource(self.definition)
 
+class ExpressionStepDefinition(StepDefinition):
+    """A step definition given by a Cucumber expression.
+    
+    The values of its parameters are converted by their types before
+    being passed to the definition.
+    """
+    
+    def __init__(self, expression, definition, registry=None):
+        self.expression = compile_expression(expression)
+        self.literal = self.expression.literal
+        super(ExpressionStepDefinition, self).__init__(self.expression.regexp, definition, registry)
+    
+    def __repr__(self):
+        return repr(self.expression.text)
+    
+    def __call__(self, step):
+        self.definition(step, *self.expression.convert(step.match.groups()))
+    
+    def getsourcebits(self):
+        return self.expression.text, inspect.getsource(self.definition)
+
+
+class StepRegistry(object):
+    """Step definitions only visible to some features.
+    
+    A feature sees the registries named by the using argument of its
+    loader, those whose directory contains its file, and those whose tag
+    it has.
+    """
+    
+    def __init__(self, name, directory=None, tag=None):
+        self.name = name
+        self.directory = None
+        self.tag = None
+        self.scope(directory, tag)
+        self.step_definitions = []
+        self.index = None
+    
+    def __repr__(self):
+        return '<%s %r>' % (type(self).__name__, self.name)
+    
+    def scope(self, directory=None, tag=None):
+        if directory is not None:
+            self.directory = os.path.join(os.path.abspath(directory), '')
+        if tag is not None:
+            self.tag = tag.lstrip('@')
+    
+    def add_step_definition(self, step_definition):
+        self.step_definitions.append(step_definition)
+        StepDefinition.version += 1
+    
+    def clear(self):
+        self.step_definitions = []
+        self.index = None
+        StepDefinition.version += 1
+    
+    def get_step_definitions(self, s):
+        index = self.index = update_index(self.index, self.step_definitions)
+        for step_definition in index.candidates(s):
+            match = step_definition.match(s)
+            if match:
+                yield step_definition, match
+    
+    def is_used_by(self, path, tags, using):
+        if self.name in using:
+            return True
+        if self.tag is not None and self.tag in tags:
+            return True
+        return self.directory is not None and path is not None \
+            and os.path.abspath(path).startswith(self.directory)
+
+
+step_registries = dict()
+
+def step_registry(name, directory=None, tag=None):
+    """Return the StepRegistry called name, creating it on first use.
+    
+    With directory or tag, the registry is used by the features below
+    directory or having tag.
+    """
+    registry = step_registries.get(name)
+    if registry is None:
+        registry = step_registries[name] = StepRegistry(name, directory, tag)
+    else:
+        registry.scope(directory, tag)
+    return registry
+
+def find_step_registries(path=None, tags=(), using=(), create=False):
+    """Return the registries used by the feature at path with tags, sorted by name.
+    
+    Names like <string> of features not read from a file are no path, so
+    directory scopes don't apply to them. Raises ValueError for names in
+    using without a registry, unless create is true, as when steps are
+    only defined after loading.
+    """
+    if not isinstance(path, six.string_types) or path.startswith('<') and path.endswith('>'):
+        path = None
+    if isinstance(using, six.string_types):
+        using = (using,)
+    for name in using:
+        if create:
+            step_registry(name)
+        elif name not in step_registries:
+            raise ValueError('unknown step registry %r' % name)
+    return tuple(step_registries[name] for name in sorted(step_registries)
+        if step_registries[name].is_used_by(path, tags, using))
 
-def define_step(pattern, definition):
-    StepDefinition(pattern, definition)
+def define_step(pattern, definition, expression=False, using=None):
+    registry = None if using is None else step_registry(using)
+    (ExpressionStepDefinition if expression else StepDefinition)(pattern, definition, registry)
 
-def step(pattern):
+def step(pattern, expression=False, using=None):
     def step_definition(definition):
-        StepDefinition(pattern, definition)
+        define_step(pattern, definition, expression, using)
         return definition
     return step_definition
 
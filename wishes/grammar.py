@@ -0,0 +1,283 @@
+# -*- coding:utf-8 -*-
+# Autogenerated from parser.yaml by make_grammar.py, do not edit.
+#=============================================================================
+#   grammar.py --- Parser states and patterns
+#=============================================================================
+from __future__ import unicode_literals
+
+
+config = {'blocks': {'background_hash': ['hash_block_line', 'hash_data_block'],
+            'background_multiline': ['multiline_block_line', 'data_block'],
+            'examples_hash': ['hash_block_line', 'hash_data_block'],
+            'hash': ['hash_block_line', 'hash_data_block'],
+            'multiline': ['multiline_block_line', 'data_block'],
+            'outline_hash': ['hash_block_line', 'hash_data_block'],
+            'outline_multiline': ['multiline_block_line', 'data_block']},
+ 'guards': {'multiline_end': 'is_multiline_end'},
+ 'patterns': {'background': '\\s*Background:(.*)',
+              'comment': '\\s*#(.*)',
+              'description': '\\s*(.*)',
+              'examples': '\\s*(?:Scenarios|Examples):(.*)',
+              'feature': '\\s*Feature:(.*)',
+              'hash': '\\s*\\|(.*)',
+              'multiline': '(\\s*""")',
+              'multiline_data': '(.*)',
+              'multiline_end': '(\\s*""")',
+              'outline': '\\s*Scenario Outline:(.*)',
+              'scenario': '\\s*Scenario:(.*)',
+              'step': '\\s*(Given|When|Then|And|But)\\s+(.*)',
+              'tags': '\\s*((@[\\w_]+\\s*)+)',
+              'whitespace': '(\\s*)$'},
+ 'states': {'background': [['step', ['start_step'], 'background_step'],
+                           ['scenario',
+                            ['finish_background', 'start_scenario'],
+                            'scenario'],
+                           ['outline',
+                            ['finish_background', 'start_outline'],
+                            'outline'],
+                           ['tags', ['finish_background', 'tags'], 'tags'],
+                           ['comment', ['comment'], 'background']],
+            'background_hash': [['hash', ['hash_line'], 'background_hash'],
+                                ['step',
+                                 ['finish_hash', 'finish_step', 'start_step'],
+                                 'background_step'],
+                                ['scenario',
+                                 ['finish_hash',
+                                  'finish_step',
+                                  'finish_background',
+                                  'start_scenario'],
+                                 'scenario'],
+                                ['outline',
+                                 ['finish_hash',
+                                  'finish_step',
+                                  'finish_background',
+                                  'start_outline'],
+                                 'outline'],
+                                ['tags',
+                                 ['finish_hash',
+                                  'finish_step',
+                                  'finish_background',
+                                  'tags'],
+                                 'tags'],
+                                ['comment', ['comment'], 'background_hash']],
+            'background_multiline': [['multiline_end',
+                                      ['finish_multiline'],
+                                      'background_step'],
+                                     ['multiline_data',
+                                      ['multiline_data'],
+                                      'background_multiline']],
+            'background_step': [['step',
+                                 ['finish_step', 'start_step'],
+                                 'background_step'],
+                                ['scenario',
+                                 ['finish_step',
+                                  'finish_background',
+                                  'start_scenario'],
+                                 'scenario'],
+                                ['outline',
+                                 ['finish_step',
+                                  'finish_background',
+                                  'start_outline'],
+                                 'outline'],
+                                ['tags',
+                                 ['finish_step', 'finish_background', 'tags'],
+                                 'tags'],
+                                ['multiline',
+                                 ['start_multiline'],
+                                 'background_multiline'],
+                                ['hash', ['start_hash'], 'background_hash'],
+                                ['comment', ['comment'], 'background_step']],
+            'description': [['scenario',
+                             ['finish_description', 'start_scenario'],
+                             'scenario'],
+                            ['background',
+                             ['finish_description', 'start_background'],
+                             'background'],
+                            ['outline',
+                             ['finish_description', 'start_outline'],
+                             'outline'],
+                            ['tags', ['finish_description', 'tags'], 'tags'],
+                            ['comment', ['comment'], 'description'],
+                            ['description', ['data'], 'description'],
+                            [None,
+                             ['finish_description', 'finish_feature'],
+                             None]],
+            'examples': [['hash', ['start_hash'], 'examples_hash'],
+                         ['scenario',
+                          ['finish_examples', 'start_scenario'],
+                          'scenario'],
+                         ['background',
+                          ['finish_examples', 'start_background'],
+                          'background'],
+                         ['outline',
+                          ['finish_examples', 'start_outline'],
+                          'outline'],
+                         ['examples',
+                          ['finish_examples', 'start_examples'],
+                          'examples'],
+                         ['tags', ['finish_examples', 'tags'], 'tags'],
+                         ['comment', ['comment'], 'examples'],
+                         [None, ['finish_examples', 'finish_feature'], None]],
+            'examples_hash': [['hash', ['hash_line'], 'examples_hash'],
+                              ['scenario',
+                               ['finish_hash',
+                                'finish_examples',
+                                'start_scenario'],
+                               'scenario'],
+                              ['background',
+                               ['finish_hash',
+                                'finish_examples',
+                                'start_background'],
+                               'background'],
+                              ['outline',
+                               ['finish_hash',
+                                'finish_examples',
+                                'start_outline'],
+                               'outline'],
+                              ['examples',
+                               ['finish_hash',
+                                'finish_examples',
+                                'start_examples'],
+                               'examples'],
+                              ['tags',
+                               ['finish_hash', 'finish_examples', 'tags'],
+                               'tags'],
+                              ['comment', ['comment'], 'examples_hash'],
+                              [None,
+                               ['finish_hash',
+                                'finish_examples',
+                                'finish_feature'],
+                               None]],
+            'feature': [['scenario', ['start_scenario'], 'scenario'],
+                        ['background', ['start_background'], 'background'],
+                        ['outline', ['start_outline'], 'outline'],
+                        ['tags', ['tags'], 'tags'],
+                        ['comment', ['comment'], 'feature'],
+                        ['description',
+                         ['start_description', 'data'],
+                         'description'],
+                        [None, ['finish_feature'], None]],
+            'hash': [['hash', ['hash_line'], 'hash'],
+                     ['step',
+                      ['finish_hash', 'finish_step', 'start_step'],
+                      'step'],
+                     ['scenario',
+                      ['finish_hash',
+                       'finish_step',
+                       'finish_scenario',
+                       'start_scenario'],
+                      'scenario'],
+                     ['background',
+                      ['finish_hash',
+                       'finish_step',
+                       'finish_scenario',
+                       'start_background'],
+                      'background'],
+                     ['outline',
+                      ['finish_hash',
+                       'finish_step',
+                       'finish_scenario',
+                       'start_outline'],
+                      'outline'],
+                     ['tags',
+                      ['finish_hash', 'finish_step', 'finish_scenario', 'tags'],
+                      'tags'],
+                     ['comment', ['comment'], 'hash'],
+                     [None,
+                      ['finish_hash',
+                       'finish_step',
+                       'finish_scenario',
+                       'finish_feature'],
+                      None]],
+            'multiline': [['multiline_end', ['finish_multiline'], 'step'],
+                          ['multiline_data', ['multiline_data'], 'multiline']],
+            'outline': [['step', ['start_step'], 'outline_step'],
+                        ['examples',
+                         ['finish_outline', 'start_examples'],
+                         'examples'],
+                        ['tags', ['finish_outline', 'tags'], 'tags'],
+                        ['comment', ['comment'], 'outline']],
+            'outline_hash': [['hash', ['hash_line'], 'outline_hash'],
+                             ['step',
+                              ['finish_hash', 'finish_step', 'start_step'],
+                              'outline_step'],
+                             ['examples',
+                              ['finish_hash',
+                               'finish_step',
+                               'finish_outline',
+                               'start_examples'],
+                              'examples'],
+                             ['tags',
+                              ['finish_hash',
+                               'finish_step',
+                               'finish_outline',
+                               'tags'],
+                              'tags'],
+                             ['comment', ['comment'], 'outline_hash']],
+            'outline_multiline': [['multiline_end',
+                                   ['finish_multiline'],
+                                   'outline_step'],
+                                  ['multiline_data',
+                                   ['multiline_data'],
+                                   'outline_multiline']],
+            'outline_step': [['step',
+                              ['finish_step', 'start_step'],
+                              'outline_step'],
+                             ['examples',
+                              ['finish_step',
+                               'finish_outline',
+                               'start_examples'],
+                              'examples'],
+                             ['tags',
+                              ['finish_step', 'finish_outline', 'tags'],
+                              'tags'],
+                             ['multiline',
+                              ['start_multiline'],
+                              'outline_multiline'],
+                             ['hash', ['start_hash'], 'outline_hash'],
+                             ['comment', ['comment'], 'outline_step']],
+            'scenario': [['step', ['start_step'], 'step'],
+                         ['scenario',
+                          ['finish_scenario', 'start_scenario'],
+                          'scenario'],
+                         ['background',
+                          ['finish_scenario', 'start_background'],
+                          'background'],
+                         ['outline',
+                          ['finish_scenario', 'start_outline'],
+                          'outline'],
+                         ['tags', ['finish_scenario', 'tags'], 'tags'],
+                         ['comment', ['comment'], 'scenario'],
+                         [None, ['finish_scenario', 'finish_feature'], None]],
+            'start': [['feature', ['start_feature'], 'feature'],
+                      ['tags', ['tags'], 'start'],
+                      ['comment', ['comment'], 'start'],
+                      [None, [], None]],
+            'step': [['step', ['finish_step', 'start_step'], 'step'],
+                     ['scenario',
+                      ['finish_step', 'finish_scenario', 'start_scenario'],
+                      'scenario'],
+                     ['background',
+                      ['finish_step', 'finish_scenario', 'start_background'],
+                      'background'],
+                     ['outline',
+                      ['finish_step', 'finish_scenario', 'start_outline'],
+                      'outline'],
+                     ['tags',
+                      ['finish_step', 'finish_scenario', 'tags'],
+                      'tags'],
+                     ['multiline', ['start_multiline'], 'multiline'],
+                     ['hash', ['start_hash'], 'hash'],
+                     ['comment', ['comment'], 'step'],
+                     [None,
+                      ['finish_step', 'finish_scenario', 'finish_feature'],
+                      None]],
+            'tags': [['scenario', ['start_scenario'], 'scenario'],
+                     ['background', ['start_background'], 'background'],
+                     ['outline', ['start_outline'], 'outline'],
+                     ['examples', ['start_examples'], 'examples'],
+                     ['tags', ['tags'], 'tags'],
+                     ['comment', ['comment'], 'tags']]}}
+
+#.............................................................................
+#   grammar.py
@@ -0,0 +1,169 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   index.py --- Sidecar offset index of feature files
+#=============================================================================
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import os
+
+from .parser import Parser, EventHandler
+
+
+class FeatureIndex(object):
+    """Byte offsets and line ranges of the blocks of one feature file.
+    
+    Blocks are the Background, Scenario, Scenario Outline and Examples
+    sections, each one starting with the tags above it and reaching up
+    to the next block. Everything before the first block is the header.
+    The index is stored as JSON beside the feature file, or in cache_dir,
+    and is rebuilt when the file's mtime or size change.
+    """
+    version = 1
+    kinds = dict(
+        start_background='background',
+        start_scenario='scenario',
+        start_outline='outline',
+        start_examples='examples',
+    )
+    
+    def __init__(self, path, mtime, size, blocks):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.blocks = blocks
+    
+    @classmethod
+    def load(cls, path, cache_dir=None):
+        index_path = cls.index_path(path, cache_dir)
+        stat = os.stat(path)
+        try:
+            with open(index_path) as stream:
+                data = json.load(stream)
+        except (IOError, OSError, ValueError):
+            data = None
+        if data is not None and data.get('version') == cls.version \
+                and data['mtime'] == stat.st_mtime and data['size'] == stat.st_size:
+            return cls(path, data['mtime'], data['size'], data['blocks'])
+        index = cls.build(path)
+        try:
+            index.save(index_path)
+        except (IOError, OSError):
+            pass
+        return index
+    
+    @classmethod
+    def index_path(cls, path, cache_dir=None):
+        if cache_dir is None:
+            directory, name = os.path.split(path)
+            return os.path.join(directory, '.%s.idx' % name)
+        digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+        return os.path.join(cache_dir, '%s.idx' % digest)
+    
+    @classmethod
+    def build(cls, path, encoding='utf-8'):
+        stat = os.stat(path)
+        with open(path, 'rb') as stream:
+            source = stream.read()
+        starts = [0]
+        pos = source.find(b'\n')
+        while pos >= 0:
+            starts.append(pos + 1)
+            pos = source.find(b'\n', pos + 1)
+        parser = Parser(blocks=True)
+        handler = parser.handler = EventHandler(parser)
+        parser.parse_buffer(source, path, encoding)
+        blocks = []
+        tags_line = None
+        background = outline = None
+        for event, args, line_no in handler.events:
+            if event == 'tags':
+                if tags_line is None:
+                    tags_line = line_no
+            elif event == 'start_feature':
+                tags_line = None
+            elif event in cls.kinds:
+                kind = cls.kinds[event]
+                first = line_no if tags_line is None else tags_line
+                tags_line = None
+                block = dict(kind=kind, title=args[0], first=first, start=starts[first - 1])
+                if kind == 'background':
+                    background = len(blocks)
+                elif kind == 'examples':
+                    block['outline'] = outline
+                else:
+                    block['background'] = background
+                    if kind == 'outline':
+                        outline = len(blocks)
+                blocks.append(block)
+        line_count = len(starts) if source and not source.endswith(b'\n') else len(starts) - 1
+        for block, following in zip(blocks, blocks[1:] + [None]):
+            if following is None:
+                block['last'], block['stop'] = line_count, len(source)
+            else:
+                block['last'], block['stop'] = following['first'] - 1, following['start']
+        return cls(path, stat.st_mtime, stat.st_size, blocks)
+    
+    def save(self, index_path):
+        directory = os.path.dirname(index_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(index_path, 'w') as stream:
+            json.dump(dict(
+                version=self.version,
+                mtime=self.mtime,
+                size=self.size,
+                blocks=self.blocks,
+            ), stream)
+    
+    @property
+    def header_stop(self):
+        return self.blocks[0]['start'] if self.blocks else self.size
+    
+    def find(self, line=None, title=None):
+        """Return the indices of the blocks to parse for a scenario.
+        
+        A scenario is selected by a line anywhere in its block or by its
+        title. The result includes its Background, an Examples block
+        comes with its outline and an outline with all its Examples.
+        None is returned if the line or title selects no scenario.
+        """
+        for n, block in enumerate(self.blocks):
+            if line is not None and not block['first'] <= line <= block['last']:
+                continue
+            if title is not None and (block['kind'] not in ('scenario', 'outline') or block['title'] != title):
+                continue
+            if block['kind'] == 'background':
+                return None
+            if block['kind'] == 'examples':
+                selected = [block['outline'], n]
+            elif block['kind'] == 'outline':
+                selected = [n] + [
+                    m for m, other in enumerate(self.blocks)
+                    if other['kind'] == 'examples' and other['outline'] == n
+                ]
+            else:
+                selected = [n]
+            background = self.blocks[selected[0]]['background']
+            if background is not None:
+                selected.insert(0, background)
+            return selected
+        return None
+    
+    def read(self, selected):
+        """Read the header and the selected blocks from the feature file."""
+        with open(self.path, 'rb') as stream:
+            parts = [stream.read(self.header_stop)]
+            for n in selected:
+                block = self.blocks[n]
+                stream.seek(block['start'])
+                part = stream.read(block['stop'] - block['start'])
+                if not parts[-1].endswith(b'\n'):
+                    parts[-1] += b'\n'
+                parts.append(part)
+        return b''.join(parts)
+
+#.............................................................................
+#   index.py
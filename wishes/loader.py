@@ -5,19 +5,31 @@
 #=============================================================================
 from __future__ import unicode_literals
 
+import fnmatch
+import os
 import re
 import unicodedata
+from functools import partial
 
 import six
 
-from .compat import unittest
-from .feature import FeatureTest, Scenario, Hashes, add_tags
-from .parser import Parser
+from .cache import ParseCache
+from .compat import scandir, unittest
+from .examples import find_source
+from .feature import FeatureTest, OutlineExample, Scenario, Hashes, add_tags, fill_from_example, find_step_registries
+from .index import FeatureIndex
+from .nodes import build_feature, make_parser
+from .parallel import parse_file, parse_files, parse_parallel
+from .tags import tag_expression
 
 
 class Handler(object):
     
-    def __init__(self, test_case_class=None, scenario_class=None):
+    def __init__(self, test_case_class=None, scenario_class=None, tags=None, using=(), deferred=False):
+        self.tag_expression = tag_expression(tags)
+        self.using = () if using is None else using
+        self.deferred = deferred
+        self.registries = ()
         if test_case_class is None:
             self.TestCase = unittest.TestCase
         elif not issubclass(test_case_class, unittest.TestCase):
@@ -45,6 +57,8 @@ class Handler(object):
             pass
         Feature.__name__ = self.make_feature_name(title)
         Feature.title = title
+        self.feature_tags = set(self.pending_tags or ())
+        self.registries = find_step_registries(self.feature_name, self.feature_tags, self.using, self.deferred)
         if add_tags is not None and self.pending_tags is not None:
             add_tags(Feature, self.pending_tags)
             self.pending_tags = None
@@ -54,7 +68,10 @@ class Handler(object):
         self.hashes = None
     
     def finish_feature(self):
-        self.suite = unittest.defaultTestLoader.loadTestsFromTestCase(self.Feature)
+        if self.tag_expression is not None and not self.Feature.scenarios:
+            self.suite = unittest.TestSuite()
+        else:
+            self.suite = self.Feature.make_suite()
     
     def start_description(self):
         self.lines = []
@@ -65,44 +82,73 @@ class Handler(object):
     
     def start_scenario(self, title):
         self.scenario_method = self.make_scenario_method_name(title)
-        self.scenario = self.Scenario(title, background=self.background, tags=self.pending_tags)
+        if self.is_selected(self.pending_tags, self.background):
+            self.scenario = self.make_scenario(title, background=self.background, tags=self.pending_tags)
+        else:
+            self.scenario = None
         self.pending_tags = None
     
     def finish_scenario(self):
-        self.Feature.add_scenario(self.scenario_method, self.scenario)
+        if self.scenario is not None:
+            self.Feature.add_scenario(self.scenario_method, self.scenario)
     
     def start_background(self, title):
-        self.scenario = self.Scenario(title, tags=self.pending_tags)
+        self.scenario = self.make_scenario(title, tags=self.pending_tags)
         self.pending_tags = None
     
     def finish_background(self):
         self.background = self.scenario
     
     def start_outline(self, title):
-        self.scenario = self.Scenario(title, background=self.background, tags=self.pending_tags)
+        self.scenario = self.make_scenario(title, background=self.background, tags=self.pending_tags)
         self.pending_tags = None
     
     def finish_outline(self):
         self.outline = self.scenario
     
     def start_examples(self, title):
-        self.examples = self.make_example_name(title)
+        self.examples = title
     
     def finish_examples(self):
-        self.hashes.fix_keys_for_outline()
-        for n, example in enumerate(self.hashes):
-            scenario = self.Scenario(outline=(self.outline, example), tags=self.pending_tags)
-            title = '%s %d %s' % (scenario.title, n + 1, self.examples)
-            scenario_method = self.make_scenario_method_name(title)
-            self.Feature.add_scenario(scenario_method, scenario)
+        if self.is_selected(self.pending_tags, self.outline):
+            source = find_source(self.examples, self.feature_name)
+            for scenario_method, keys, row in self.iter_examples(self.outline.title, self.examples, self.hashes, source):
+                example = OutlineExample(self.Scenario, self.outline, keys, row, self.pending_tags, source)
+                self.Feature.add_scenario(scenario_method, example)
         self.hashes = None
         self.pending_tags = None
     
+    def iter_examples(self, outline_title, title, hashes, source=None):
+        """Yield method name, keys and row of each example of an outline.
+        
+        The rows come from hashes, or only their keys if the examples have
+        a source, whose handles are yielded as rows then.
+        """
+        examples = self.make_example_name(title)
+        if hashes is None:
+            hashes = Hashes()
+        if source is None:
+            rows = ((row, row) for row in hashes.values)
+        else:
+            if hashes.values:
+                raise ValueError('examples %r take their rows from a source, but have a table with rows' % title)
+            if hashes.keys:
+                source.select(hashes.keys)
+            rows = iter(source)
+        keys = None
+        for n, (row, values) in enumerate(rows):
+            if keys is None:
+                keys = [hashes.fix_key_for_outline(key) for key in (hashes.keys if source is None else source.keys)]
+            title = '%s %d %s' % (fill_from_example(outline_title, dict(zip(keys, values))), n + 1, examples)
+            yield self.make_scenario_method_name(title), keys, row
+    
     def start_step(self, kind, statement):
         self.step = kind, statement
     
     def finish_step(self):
-        if self.multilines is not None:
+        if self.scenario is None:
+            self.multilines = self.hashes = None
+        elif self.multilines is not None:
             self.scenario.add_step(*self.step, multilines=self.multilines)
             self.multilines = None
         elif self.hashes is not None:
@@ -124,6 +170,9 @@ class Handler(object):
     def hash_data(self, *values):
         self.hashes.add_row(values)
     
+    def hash_data_block(self, rows):
+        self.hashes.add_rows(rows)
+    
     def finish_hash(self):
         pass
     
@@ -131,6 +180,10 @@ class Handler(object):
         if self.lines is not None:
             self.lines.append(data)
     
+    def data_block(self, lines):
+        if self.lines is not None:
+            self.lines.extend(lines)
+    
     def tags(self, *tags):
         if self.pending_tags is None:
             self.pending_tags = set(tags)
@@ -143,6 +196,23 @@ class Handler(object):
     def whitespace(self, data):
         self.data(data)
     
+    def make_scenario(self, title, **kwargs):
+        scenario = self.Scenario(title, **kwargs)
+        if self.registries:
+            scenario.registries = self.registries
+        if self.deferred:
+            scenario.deferred = True
+        return scenario
+    
+    def is_selected(self, tags, parent):
+        """Tell if a scenario with tags below parent matches the tag expression."""
+        if self.tag_expression is None:
+            return True
+        tags = self.feature_tags | set(tags or ())
+        if parent is not None and parent.tags is not None:
+            tags |= parent.tags
+        return self.tag_expression(tags)
+    
     def make_feature_name(self, title):
         return str('Feature_' + slugify(title))
     
@@ -158,16 +228,227 @@ def slugify(value):
     return six.text_type(re.sub('[-\s]+', '_', value))
 
 
+class LazySuite(unittest.TestSuite):
+    """Test suite that builds the suite of each feature when iterated.
+    
+    Features are given as callables returning their suite. Nothing is
+    kept of a feature's suite once it ran, so only tests kept by the
+    result, like failures, outlive their feature.
+    """
+    
+    def __init__(self, features=()):
+        super(LazySuite, self).__init__()
+        self.features = list(features)
+    
+    def __iter__(self):
+        for test in self._tests:
+            yield test
+        for feature in self.features:
+            yield feature()
+    
+    def _removeTestAtIndex(self, index):
+        pass
+
+
 class Loader(object):
+    """Loader of feature tests.
+    
+    With a cache_dir, parsed features are kept there. With deferred,
+    steps are only matched to their definitions when their scenario
+    starts to run, so step definitions may be imported after loading.
+    """
     
-    def load_feature(self, feature, test_case_class=None, scenario_class=None):
-        handler = Handler(test_case_class, scenario_class)
-        parser = Parser(handler)
+    def __init__(self, cache_dir=None, deferred=False):
+        self.cache = None if cache_dir is None else ParseCache(cache_dir)
+        self.deferred = deferred
+    
+    def load_feature(self, feature, test_case_class=None, scenario_class=None, tags=None, using=None):
+        return self.build_suite(self.parse_feature(feature), test_case_class, scenario_class, tags, using)
+    
+    def load_feature_file(self, path, test_case_class=None, scenario_class=None, encoding='utf-8',
+            workers=1, tags=None, using=None):
+        return self.build_suite(self.parse_feature_file(path, encoding, workers),
+            test_case_class, scenario_class, tags, using)
+    
+    def load_features(self, paths, test_case_class=None, scenario_class=None, encoding='utf-8',
+            workers=1, tags=None, using=None):
+        """Load feature files into one suite, in the order of paths.
+        
+        The files are parsed by a pool of workers, which send back their
+        FeatureNodes. The feature test cases are then built from these.
+        """
+        paths = list(paths)
+        features = [None] * len(paths)
+        digests = [None] * len(paths)
+        if self.cache is not None:
+            for n, path in enumerate(paths):
+                with open(path, 'rb') as stream:
+                    digests[n], features[n] = self.load_cached(path, stream.read(), encoding)
+        missing = [n for n, feature in enumerate(features) if feature is None]
+        parsed = parse_files([paths[n] for n in missing], workers, encoding)
+        for n, feature in zip(missing, parsed):
+            features[n] = feature
+            self.save_cached(paths[n], digests[n], feature, encoding)
+        tags = tag_expression(tags)
+        suite = unittest.TestSuite()
+        for feature in features:
+            suite.addTest(self.build_suite(feature, test_case_class, scenario_class, tags, using))
+        return suite
+    
+    def load_scenario(self, path, line=None, title=None, test_case_class=None, scenario_class=None,
+            encoding='utf-8', cache_dir=None, using=None):
+        """Load the scenario at line or with title from the feature file at path.
+        
+        Only the feature header, the scenario and its Background are read
+        and parsed, located by the FeatureIndex of the file. A line outside
+        of any scenario loads the whole feature. Steps are matched as by
+        build_suite.
+        """
+        index = FeatureIndex.load(path, cache_dir)
+        selected = index.find(line, title)
+        if selected is None:
+            if title is not None:
+                raise ValueError('no scenario %r in %s' % (title, path))
+            return self.load_feature_file(path, test_case_class, scenario_class, encoding, using=using)
+        parser = make_parser()
+        parser.parse_buffer(index.read(selected), path, encoding)
+        return self.build_suite(parser.handler.feature, test_case_class, scenario_class, using=using)
+    
+    def parse_feature(self, feature):
+        """Parse feature source, a string or file-like, into a FeatureNode."""
+        parser = make_parser()
         parser.parse(feature)
+        return parser.handler.feature
+    
+    def parse_feature_file(self, path, encoding='utf-8', workers=1):
+        """Parse the feature file at path into a FeatureNode.
+        
+        With more than one worker, large files are split at scenario
+        boundaries and the chunks are parsed by a process pool. Their
+        events are joined in order, so the result is the same as from a
+        single parse. With a cache_dir, the nodes of unchanged files are
+        taken from the cache instead of parsing them again.
+        """
+        if self.cache is None and workers <= 1:
+            return parse_file((path, encoding))
+        with open(path, 'rb') as stream:
+            source = stream.read()
+        digest, feature = self.load_cached(path, source, encoding)
+        if feature is None:
+            feature = build_feature(parse_parallel(source, path, workers, encoding))
+            self.save_cached(path, digest, feature, encoding)
+        return feature
+    
+    def build_suite(self, feature, test_case_class=None, scenario_class=None, tags=None, using=None):
+        """Build the test suite of a FeatureNode.
+        
+        With tags, a tag expression, only the scenarios and examples that
+        match it are built. Steps are matched against the global step
+        definitions and the registries the feature uses, including those
+        named by using, a name or list of names.
+        """
+        handler = Handler(test_case_class, scenario_class, tags, using, self.deferred)
+        feature.replay(handler)
         return handler.suite
+    
+    def load_cached(self, path, source, encoding='utf-8'):
+        if self.cache is None:
+            return None, None
+        digest = self.cache.digest(source)
+        feature = self.cache.load(path, digest, encoding)
+        if feature is not None:
+            feature.name = path
+        return digest, feature
+    
+    def save_cached(self, path, digest, feature, encoding='utf-8'):
+        if self.cache is not None:
+            try:
+                self.cache.save(path, digest, feature, encoding)
+            except (IOError, OSError):
+                pass
+    
+    def discover(self, start_dir, include=('*.feature',), exclude=(), tags=None,
+            test_case_class=None, scenario_class=None, encoding='utf-8', workers=1, lazy=False, using=None):
+        """Load all feature files below start_dir into one suite.
+        
+        Files are found by find_features(). With tags, a tag expression
+        or a list of tags of which any one must match, only the matching
+        scenarios are loaded. Files that mention none of the tags are
+        skipped without parsing, unless the expression uses not. With
+        lazy, a LazySuite of the files is returned.
+        """
+        paths = find_features(start_dir, include, exclude)
+        tags = tag_expression(tags)
+        if tags is not None and not tags.uses_not:
+            paths = (path for path in paths if mentions_tags(path, tags.tags))
+        if lazy:
+            return self.stream_features(paths, test_case_class, scenario_class, encoding, tags, using)
+        return self.load_features(paths, test_case_class, scenario_class, encoding, workers, tags, using)
+    
+    def stream_features(self, paths, test_case_class=None, scenario_class=None, encoding='utf-8',
+            tags=None, using=None):
+        """Return a LazySuite of feature files, in the order of paths.
+        
+        Each file is parsed when the suite gets to it, so memory is
+        bounded by the largest feature instead of all of them.
+        """
+        return LazySuite(
+            partial(self.load_feature_file, path, test_case_class, scenario_class, encoding,
+                tags=tags, using=using)
+            for path in paths
+        )
+
+def find_features(start_dir, include=('*.feature',), exclude=()):
+    """Yield the paths of files below start_dir.
+    
+    Each directory's files come in sorted order, before the files of its
+    subdirectories. Like os.walk, symbolic links to directories are not
+    followed.
+    File names must match one of the include globs. Files and directories
+    are skipped if their name or their path relative to start_dir matches
+    one of the exclude globs.
+    """
+    directories = [start_dir]
+    while directories:
+        directory = directories.pop()
+        subdirectories = []
+        for entry in sorted(scandir(directory), key=lambda entry: entry.name):
+            relative = os.path.relpath(entry.path, start_dir).replace(os.sep, '/')
+            if any(fnmatch.fnmatch(entry.name, glob) or fnmatch.fnmatch(relative, glob) for glob in exclude):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif entry.is_file() and any(fnmatch.fnmatch(entry.name, glob) for glob in include):
+                yield entry.path
+        directories.extend(reversed(subdirectories))
+
+def mentions_tags(path, tags):
+    """Tell if the file at path contains one of tags, without parsing it."""
+    tags_re = re.compile(('@(?:%s)(?![\\w\\x80-\\xff])' % '|'.join(re.escape(tag) for tag in tags)).encode('utf-8'))
+    with open(path, 'rb') as stream:
+        return tags_re.search(stream.read()) is not None
+
+def make_load_tests(start_dir, include=('*.feature',), exclude=(), tags=None, **kwargs):
+    """Return a load_tests() function for unittest discovery.
+    
+    Assign it to load_tests in a test module or package to add the
+    features below start_dir to the tests found by unittest:
+        
+        load_tests = make_load_tests(os.path.dirname(__file__))
+    """
+    def load_tests(loader, tests, pattern):
+        tests.addTest(defaultLoader.discover(start_dir, include, exclude, tags, **kwargs))
+        return tests
+    return load_tests
+
 
 defaultLoader = Loader()
 load_feature = defaultLoader.load_feature
+load_feature_file = defaultLoader.load_feature_file
+load_features = defaultLoader.load_features
+stream_features = defaultLoader.stream_features
+discover = defaultLoader.discover
+load_scenario = defaultLoader.load_scenario
 
 #.............................................................................
 #   loader.py
@@ -0,0 +1,48 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   make_grammar.py --- Freeze parser.yaml into grammar.py
+#
+#  grammar.py should be re-created after each change in parser.yaml:
+#
+#      python -m wishes.make_grammar
+#=============================================================================
+from __future__ import print_function
+
+import os.path
+import pprint
+
+import yaml
+
+
+source = os.path.join(os.path.dirname(__file__), 'parser.yaml')
+target = os.path.join(os.path.dirname(__file__), 'grammar.py')
+
+def load_config(path=source):
+    with open(path) as stream:
+        return yaml.safe_load(stream)
+
+def dump_config(config, stream):
+    print('''\
+# -*- coding:utf-8 -*-
+# Autogenerated from parser.yaml by make_grammar.py, do not edit.
+#=============================================================================
+#   grammar.py --- Parser states and patterns
+#=============================================================================
+from __future__ import unicode_literals
+
+
+config = {0}
+
+#.............................................................................
+#   grammar.py'''.format(pprint.pformat(config)), file=stream)
+
+def main():
+    with open(target, 'w') as stream:
+        dump_config(load_config(), stream)
+
+if __name__ == '__main__':
+    main()
+
+#.............................................................................
+#   make_grammar.py
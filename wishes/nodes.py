@@ -0,0 +1,259 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   nodes.py --- Compact syntax tree of parsed features
+#=============================================================================
+from __future__ import unicode_literals
+
+from .parser import Parser
+
+
+class Node(object):
+    """Base of the syntax tree nodes.
+    
+    Nodes only hold strings, tuples, lists and other nodes in __slots__,
+    so they are small, picklable and compare by value.
+    """
+    __slots__ = ()
+    
+    def __init__(self, *args, **kwargs):
+        for slot, value in zip(self.__slots__, args):
+            setattr(self, slot, value)
+        for slot in self.__slots__[len(args):]:
+            setattr(self, slot, kwargs.pop(slot, None))
+        if kwargs:
+            raise TypeError('unexpected arguments %s' % ', '.join(sorted(kwargs)))
+    
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+    
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+    
+    def __eq__(self, other):
+        return type(self) is type(other) and self.__getstate__() == other.__getstate__()
+    
+    def __ne__(self, other):
+        return not self == other
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join(
+            '%s=%r' % (slot, getattr(self, slot)) for slot in self.__slots__
+        ))
+
+
+class FeatureNode(Node):
+    """The feature of one source; title is None if it has no Feature line."""
+    __slots__ = ('name', 'title', 'tags', 'description', 'blocks')
+    
+    def replay(self, handler):
+        """Make the handler calls of parsing the feature."""
+        handler.start_parse(self.name)
+        if self.title is not None:
+            if self.tags:
+                handler.tags(*self.tags)
+            handler.start_feature(self.title)
+            if self.description is not None:
+                handler.start_description()
+                handler.data(self.description)
+                handler.finish_description()
+            for block in self.blocks:
+                block.replay(handler)
+            handler.finish_feature()
+        handler.finish_parse()
+
+
+class ScenarioNode(Node):
+    """A Background, Scenario or Scenario Outline, told apart by kind."""
+    __slots__ = ('kind', 'title', 'tags', 'line', 'steps', 'examples')
+    
+    def replay(self, handler):
+        if self.tags:
+            handler.tags(*self.tags)
+        getattr(handler, 'start_' + self.kind)(self.title)
+        for step in self.steps:
+            step.replay(handler)
+        getattr(handler, 'finish_' + self.kind)()
+        for examples in self.examples or ():
+            examples.replay(handler)
+
+
+class StepNode(Node):
+    __slots__ = ('kind', 'text', 'multilines', 'keys', 'rows')
+    
+    def replay(self, handler):
+        handler.start_step(self.kind, self.text)
+        if self.multilines is not None:
+            handler.start_multiline(0)
+            if self.multilines:
+                handler.data_block(self.multilines)
+            handler.finish_multiline()
+        elif self.keys is not None:
+            replay_hash(self.keys, self.rows, handler)
+        handler.finish_step()
+
+
+class ExamplesNode(Node):
+    __slots__ = ('title', 'tags', 'line', 'keys', 'rows')
+    
+    def replay(self, handler):
+        if self.tags:
+            handler.tags(*self.tags)
+        handler.start_examples(self.title)
+        if self.keys is not None:
+            replay_hash(self.keys, self.rows, handler)
+        handler.finish_examples()
+
+
+def replay_hash(keys, rows, handler):
+    handler.start_hash(*keys)
+    if rows:
+        handler.hash_data_block(rows)
+    handler.finish_hash()
+
+
+class NodeBuilder(object):
+    """Parser handler that builds a FeatureNode.
+    
+    Comments and whitespace are dropped, tags are collected in order of
+    their first appearance and attached to the next node. Line numbers
+    are taken from position, usually the parser.
+    """
+    
+    def __init__(self, position=None):
+        self.position = position
+    
+    @property
+    def line_no(self):
+        return None if self.position is None else self.position.line_no
+    
+    def start_parse(self, name):
+        self.feature = FeatureNode(name, blocks=[])
+        self.pending_tags = None
+        self.lines = None
+        self.hash = None
+    
+    def finish_parse(self):
+        pass
+    
+    def take_tags(self):
+        tags, self.pending_tags = self.pending_tags, None
+        return None if tags is None else tuple(tags)
+    
+    def tags(self, *tags):
+        if self.pending_tags is None:
+            self.pending_tags = []
+        for tag in tags:
+            if tag not in self.pending_tags:
+                self.pending_tags.append(tag)
+    
+    def start_feature(self, title):
+        self.feature.title = title
+        self.feature.tags = self.take_tags()
+    
+    def finish_feature(self):
+        pass
+    
+    def start_description(self):
+        self.lines = []
+    
+    def finish_description(self):
+        self.feature.description = ''.join(self.lines)
+        self.lines = None
+    
+    def start_block(self, kind, title):
+        self.scenario = ScenarioNode(kind, title, self.take_tags(), self.line_no, [])
+        if kind == 'outline':
+            self.scenario.examples = []
+        self.feature.blocks.append(self.scenario)
+    
+    def start_background(self, title):
+        self.start_block('background', title)
+    
+    def start_scenario(self, title):
+        self.start_block('scenario', title)
+    
+    def start_outline(self, title):
+        self.start_block('outline', title)
+    
+    def finish_background(self):
+        pass
+    
+    finish_scenario = finish_outline = finish_background
+    
+    def start_examples(self, title):
+        self.examples = ExamplesNode(title, self.take_tags(), self.line_no)
+        self.scenario.examples.append(self.examples)
+    
+    def finish_examples(self):
+        if self.hash is not None:
+            self.examples.keys, self.examples.rows = self.hash
+            self.hash = None
+    
+    def start_step(self, kind, statement):
+        self.step = StepNode(kind, statement)
+    
+    def finish_step(self):
+        if self.hash is not None:
+            self.step.keys, self.step.rows = self.hash
+            self.hash = None
+        self.scenario.steps.append(self.step)
+    
+    def start_multiline(self, indent):
+        self.lines = []
+    
+    def finish_multiline(self):
+        self.step.multilines = self.lines
+        self.lines = None
+    
+    def start_hash(self, *keys):
+        self.hash = keys, []
+    
+    def hash_data(self, *values):
+        self.hash[1].append(values)
+    
+    def hash_data_block(self, rows):
+        self.hash[1].extend(rows)
+    
+    def finish_hash(self):
+        pass
+    
+    def data(self, data):
+        if self.lines is not None:
+            self.lines.append(data)
+    
+    def data_block(self, lines):
+        if self.lines is not None:
+            self.lines.extend(lines)
+    
+    def comment(self, data):
+        pass
+    
+    def whitespace(self, data):
+        self.data(data)
+
+
+def make_parser():
+    """Return a Parser in block mode with a NodeBuilder as its handler."""
+    builder = NodeBuilder()
+    builder.position = Parser(builder, blocks=True)
+    return builder.position
+
+
+class Position(object):
+    line_no = None
+
+
+def build_feature(events):
+    """Build the FeatureNode of (event, args, line_no) tuples."""
+    position = Position()
+    builder = NodeBuilder(position)
+    for event, args, position.line_no in events:
+        getattr(builder, event)(*args)
+    return builder.feature
+
+#.............................................................................
+#   nodes.py
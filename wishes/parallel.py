@@ -0,0 +1,146 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   parallel.py --- Parse features in worker processes
+#=============================================================================
+from __future__ import unicode_literals
+
+import multiprocessing
+import re
+
+from . import grammar
+from .nodes import make_parser
+from .parser import Parser, EventHandler, to_bytes_pattern
+
+
+min_chunk_size = 64 * 1024
+
+def compile_bytes_pattern(key):
+    return re.compile(to_bytes_pattern(grammar.config['patterns'][key]))
+
+scenario_re = compile_bytes_pattern('scenario')
+outline_re = compile_bytes_pattern('outline')
+background_re = compile_bytes_pattern('background')
+tags_re = compile_bytes_pattern('tags')
+comment_re = compile_bytes_pattern('comment')
+
+def iter_split_points(source):
+    """Yield offsets of source where a chunk may start.
+    
+    A chunk starts with a Scenario or Scenario Outline, or with the tags
+    above it, that follows another Scenario or Scenario Outline, so the
+    chunk before ends in a state that may see the end of input.
+    Multiline strings are skipped.
+    """
+    pos, size = 0, len(source)
+    multiline = tags_start = block = None
+    while pos < size:
+        stop = source.find(b'\n', pos)
+        stop = size if stop < 0 else stop + 1
+        line = source[pos:stop]
+        stripped = line.lstrip()
+        indent = len(line) - len(stripped)
+        if multiline is not None:
+            if stripped.startswith(b'"""') and indent == multiline:
+                multiline = None
+        elif stripped.startswith(b'"""'):
+            multiline = indent
+        elif tags_re.match(line):
+            if tags_start is None:
+                tags_start = pos
+        elif scenario_re.match(line) or outline_re.match(line):
+            if block == 'scenario':
+                yield pos if tags_start is None else tags_start
+            block = 'scenario'
+            tags_start = None
+        elif background_re.match(line):
+            block = 'background'
+            tags_start = None
+        elif stripped and not comment_re.match(line):
+            tags_start = None
+        pos = stop
+
+def split_feature(source, count, min_size=min_chunk_size):
+    """Return the start offsets of up to count chunks of about equal size."""
+    count = min(count, len(source) // min_size)
+    if count < 2:
+        return [0]
+    targets = [len(source) * n // count for n in range(1, count)]
+    starts = [0]
+    for pos in iter_split_points(source):
+        if not targets:
+            break
+        if pos >= targets[0]:
+            starts.append(pos)
+            while targets and targets[0] <= pos:
+                targets.pop(0)
+    return starts
+
+def parse_chunk(args):
+    """Parse one chunk in a worker, returning its events.
+    
+    All chunks but the first are parsed behind a stand-in Feature line,
+    whose events are dropped again along with the end of each chunk's
+    feature, so the chunks' events join up to those of a single parse.
+    """
+    source, name, encoding, first_line, is_first, is_last = args
+    parser = Parser(blocks=True)
+    handler = parser.handler = EventHandler(parser)
+    if is_first:
+        parser.parse_buffer(source, name, encoding)
+    else:
+        parser.parse_buffer(b'Feature:\n' + source, name, encoding)
+    events = handler.events
+    if not is_first:
+        events = events[2:]
+        first_line -= 1
+    if not is_last:
+        events = events[:-2]
+    return [(event, args, line_no + first_line - 1) for event, args, line_no in events]
+
+def parse_parallel(source, name, workers, encoding='utf-8', min_size=min_chunk_size):
+    """Parse source split into chunks by a pool of workers.
+    
+    Returns the (event, args, line_no) tuples of a serial parse, in order.
+    """
+    starts = split_feature(source, workers, min_size)
+    stops = starts[1:] + [len(source)]
+    chunks = [
+        (source[start:stop], name, encoding, source.count(b'\n', 0, start) + 1,
+            n == 0, n == len(starts) - 1)
+        for n, (start, stop) in enumerate(zip(starts, stops))
+    ]
+    if len(chunks) == 1:
+        return parse_chunk(chunks[0])
+    pool = multiprocessing.Pool(min(workers, len(chunks)))
+    try:
+        results = pool.map(parse_chunk, chunks)
+    finally:
+        pool.close()
+        pool.join()
+    return [event for events in results for event in events]
+
+def parse_file(args):
+    """Parse one feature file in a worker, returning its FeatureNode."""
+    path, encoding = args
+    parser = make_parser()
+    parser.parse_file(path, encoding)
+    return parser.handler.feature
+
+def parse_files(paths, workers, encoding='utf-8'):
+    """Parse feature files by a pool of workers.
+    
+    Returns a list with the FeatureNode of each file, in the order of paths.
+    """
+    jobs = [(path, encoding) for path in paths]
+    if workers <= 1 or len(jobs) < 2:
+        return [parse_file(job) for job in jobs]
+    pool = multiprocessing.Pool(min(workers, len(jobs)))
+    try:
+        return pool.map(parse_file, jobs)
+    finally:
+        pool.close()
+        pool.join()
+
+#.............................................................................
+#   parallel.py
@@ -5,50 +5,91 @@
 #=============================================================================
 from __future__ import print_function, unicode_literals
 
-import os.path
+import collections
+import mmap
+import os
 import re
 import sys
+import time
 
-import yaml
 import six
 from io import StringIO
 
 from .compat import combinations_with_replacement
+from . import grammar
+
+
+timer = getattr(time, 'perf_counter', time.time)
 
 
 class ParseError(Exception):
     pass
 
 class Parser(object):
-    config = yaml.load(open(os.path.splitext(__file__)[0] + '.yaml'))
+    config = grammar.config
+    compiled = dict()
     
-    def __init__(self, handler=None):
+    def __init__(self, handler=None, blocks=False, stats=None):
         self.handler = LogHandler() if handler is None else handler
-        self.patterns = dict(self._compile_patterns(self.config['patterns']))
+        self.stats = stats
+        if stats is not None:
+            self.handler = TimingHandler(self.handler, stats)
+        self.patterns, self.states, self.blocks = self.compile()
         self.whitespace_pattern = self.patterns['whitespace']
-        self.states = dict(self._compile_states(self.config['states']))
+        if not blocks:
+            self.blocks = dict()
+        self.block = None
+        self.block_data = []
         self.multiline_indent = None
         self.current_state = None
+        self.line_no = 0
+    
+    @classmethod
+    def compile(cls):
+        """Compile patterns and states once per parser class.
+        
+        The tables are shared by all instances, transitions, guards and
+        block consumers are stored as plain functions and called with the
+        parser.
+        """
+        try:
+            return cls.compiled[cls]
+        except KeyError:
+            patterns = dict(cls._compile_patterns(cls.config['patterns']))
+            states = dict(cls._compile_states(cls.config['states'], patterns))
+            blocks = dict(cls._compile_blocks(cls.config['blocks']))
+            cls.compiled[cls] = patterns, states, blocks
+            return patterns, states, blocks
     
-    def _compile_states(self, states):
+    @classmethod
+    def _compile_states(cls, states, patterns):
         for key, rows in six.iteritems(states):
-            yield key, tuple(self._compile_transitions(rows))
+            rows = tuple(cls._compile_transitions(rows, patterns))
+            whitespace = (patterns['whitespace'], None, (cls.whitespace,), key, 'whitespace')
+            expected = [row[0] for row in states[key]]
+            yield key, State(rows + (whitespace,), expected)
     
-    def _compile_transitions(self, rows):
-        for pattern, transitions, next_state in rows:
-            if pattern is None:
-                matcher = None
+    @classmethod
+    def _compile_transitions(cls, rows, patterns):
+        guards = cls.config['guards']
+        for name, transitions, next_state in rows:
+            if name is None:
+                pattern = guard = None
             else:
-                try:
-                    pattern = self.patterns[pattern]
-                except KeyError:
-                    matcher = getattr(self, pattern)
-                else:
-                    matcher = pattern.match
-            transitions = tuple(getattr(self, method) for method in transitions)
-            yield matcher, transitions, next_state
-    
-    def _compile_patterns(self, patterns):
+                guard = guards.get(name)
+                if guard is not None:
+                    guard = getattr(cls, guard)
+                pattern = patterns[name]
+            transitions = tuple(getattr(cls, method) for method in transitions)
+            yield pattern, guard, transitions, next_state, name
+    
+    @classmethod
+    def _compile_blocks(cls, blocks):
+        for key, (consumer, event) in six.iteritems(blocks):
+            yield key, (getattr(cls, consumer), event)
+    
+    @classmethod
+    def _compile_patterns(cls, patterns):
         for key, value in six.iteritems(patterns):
             yield key, re.compile(value)
     
@@ -80,41 +121,163 @@ class Parser(object):
         reachable_transitions, possible_transitions = Parser.parser_transitions()
         unreachable_transitions = possible_transitions - reachable_transitions
         unreachable_transitions = sorted(list(t) for t in unreachable_transitions)
+        import yaml
         yaml.dump(unreachable_transitions, stream=stream)
     
+    @classmethod
+    def dump_stats(cls, stats, stream=sys.stdout):
+        """Print the counters of stats, busiest rows and callbacks first."""
+        print('lines per state:', file=stream)
+        for state, count in stats.lines.most_common():
+            print('  %-24s %8d %8d block %8d whitespace' % (state, count,
+                stats.block_lines[state], stats.whitespace[state]), file=stream)
+        print('matcher attempts per row:', file=stream)
+        for (state, matcher), count in stats.attempts.most_common():
+            print('  %-24s %-16s %8d %8d misses' % (state, matcher, count,
+                stats.misses[state, matcher]), file=stream)
+        print('handler callbacks:', file=stream)
+        for event, seconds in stats.time.most_common():
+            print('  %-24s %8d %10.6fs' % (event, stats.calls[event], seconds), file=stream)
+    
     def parse(self, stream):
         self.start_parse(stream)
         self.current_state = 'start'
-        for line in self.stream:
+        for self.line_no, line in enumerate(self.stream, 1):
+            if self.block is not None and self.consume_block(line):
+                continue
             self.handle_line(line)
+        self.line_no += 1
+        self.finish_block()
         self.handle_line(None)
         self.finish_parse()
     
-    def is_whitespace(self, line):
-        if line is not None:
-            match = self.whitespace_pattern.match(line)
-            if match:
-                self.match = match
-                return True
+    def parse_file(self, path, encoding='utf-8'):
+        """Memory-map the file at path and parse it with parse_buffer()."""
+        with open(path, 'rb') as stream:
+            if os.fstat(stream.fileno()).st_size == 0:
+                self.parse_buffer(b'', path, encoding)
+                return
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                self.parse_buffer(buffer, path, encoding)
+            finally:
+                buffer.close()
+    
+    def parse_buffer(self, buffer, name='<buffer>', encoding='utf-8'):
+        """Parse encoded feature source from a bytes-like buffer.
+        
+        Lines are matched in place as byte ranges of buffer; only the
+        groups and lines passed on to the handler are decoded.
+        """
+        self.encoding = encoding
+        self.stream = None
+        self.line_no = 0
+        self.handler.start_parse(name)
+        self.current_state = 'start'
+        pos, size = 0, len(buffer)
+        while pos < size:
+            stop = buffer.find(b'\n', pos)
+            if stop < 0:
+                stop = endpos = size
+            else:
+                endpos = stop
+                stop += 1
+                if endpos > pos and buffer[endpos - 1:endpos] == b'\r':
+                    endpos -= 1
+            self.line_no += 1
+            self.line_stop = stop
+            if self.block is not None:
+                line = buffer[pos:stop].decode(encoding).replace('\r\n', '\n')
+                if self.consume_block(line):
+                    pos = stop
+                    continue
+            self.handle_bytes_line(buffer, pos, endpos)
+            pos = stop
+        self.line_no += 1
+        self.finish_block()
+        self.handle_line(None)
+        self.finish_parse()
+    
+    def iter_events(self, stream):
+        """Parse stream lazily, yielding (event, args, line_no) tuples.
+        
+        Events are the handler calls parse() would make. They are handed
+        out line by line, so the caller may stop consuming at any point.
+        Events caused by the end of input have the line number after the
+        last line.
+        """
+        parser = type(self)(blocks=bool(self.blocks), stats=self.stats)
+        handler = EventHandler(parser)
+        if self.stats is None:
+            parser.handler = handler
+        else:
+            parser.handler = TimingHandler(handler, self.stats)
+        parser.start_parse(stream)
+        parser.current_state = 'start'
+        for parser.line_no, line in enumerate(parser.stream, 1):
+            if parser.block is None or not parser.consume_block(line):
+                parser.handle_line(line)
+            for event in handler.flush():
+                yield event
+        parser.line_no += 1
+        parser.finish_block()
+        parser.handle_line(None)
+        parser.finish_parse()
+        for event in handler.flush():
+            yield event
     
     def handle_line(self, line):
-        new_states = self.states[self.current_state]
-        for matcher, transitions, next_state in new_states:
-            if matcher is None or line is None:
-                match = matcher is line
-            else:
-                match = matcher(line)
-            if match:
-                self.match = match
-                for transition in transitions:
-                    transition()
-                self.current_state = next_state
-                return
-        if self.is_whitespace(line):
-            self.whitespace()
-            return
-        expected = [row[0] for row in self.config['states'][self.current_state]]
-        raise ParseError('unexpected line %r in %r, expected on of %s' % (line, self.current_state, expected))
+        state = self.states[self.current_state]
+        if line is None:
+            match, row = None, state.end
+        else:
+            match, row = state.match(self, line)
+            if self.stats is not None:
+                self.stats.add_line(self.current_state, state, row)
+        if row is None:
+            raise ParseError('unexpected line %r in %r, expected on of %s' % (line, self.current_state, state.expected))
+        self.match = match
+        for transition in row[2]:
+            transition(self)
+        self.current_state = row[3]
+        self.block = self.blocks.get(row[3])
+    
+    def handle_bytes_line(self, buffer, pos, endpos):
+        state = self.states[self.current_state]
+        match, row = state.match_bytes(self, buffer, pos, endpos)
+        if self.stats is not None:
+            self.stats.add_line(self.current_state, state, row)
+        if row is None:
+            line = buffer[pos:self.line_stop].decode(self.encoding)
+            raise ParseError('unexpected line %r in %r, expected on of %s' % (line, self.current_state, state.expected))
+        self.match = match
+        for transition in row[2]:
+            transition(self)
+        self.current_state = row[3]
+        self.block = self.blocks.get(row[3])
+    
+    def consume_block(self, line):
+        """Add line to the pending block of the current state.
+        
+        Returns False, after passing on the pending block, for the first
+        line that does not belong to the block.
+        """
+        data = self.block[0](self, line)
+        if data is None:
+            self.finish_block()
+            return False
+        self.block_data.append(data)
+        if self.stats is not None:
+            self.stats.add_block_line(self.current_state)
+        return True
+    
+    def finish_block(self):
+        if self.block_data:
+            getattr(self.handler, self.block[1])(self.block_data)
+            self.block_data = []
+    
+    def bytes_match(self, match, index, count):
+        return BytesStateMatch(match, index, count, self.line_stop, self.encoding)
     
     def start_parse(self, stream):
         if isinstance(stream, six.text_type):
@@ -125,6 +288,7 @@ class Parser(object):
             name = stream.name
         except AttributeError:
             name = '<string>'
+        self.line_no = 0
         self.handler.start_parse(name)
     
     def finish_parse(self):
@@ -189,10 +353,16 @@ class Parser(object):
         self.multiline_indent = None
         self.handler.finish_multiline()
     
-    def multiline_end(self, line):
-        match = self.patterns['multiline'].match(line)
-        if match and self.get_multiline_indent(match) == self.multiline_indent:
-            return match
+    def is_multiline_end(self, match):
+        return self.get_multiline_indent(match) == self.multiline_indent
+    
+    def multiline_block_line(self, line):
+        stripped = line.lstrip()
+        if stripped.startswith('"""') and len(line) - len(stripped) == self.multiline_indent:
+            return None
+        if line[:self.multiline_indent].strip():
+            raise ParseError('invalid dedent in multiline: %r', line)
+        return line[self.multiline_indent:]
     
     def get_multiline_indent(self, match):
         multiline_start = match.group(1)
@@ -213,9 +383,17 @@ class Parser(object):
     def hash_line(self):
         self.handler.hash_data(*self.get_hash_line_parts())
     
+    def hash_block_line(self, line):
+        line = line.lstrip()
+        if not line.startswith('|'):
+            return None
+        return self.split_hash_line(line[1:].split('\n', 1)[0])
+    
     def get_hash_line_parts(self):
-        line = self.match.group(1).rstrip('|')
-        return tuple(part.strip() for part in line.split('|'))
+        return self.split_hash_line(self.match.group(1))
+    
+    def split_hash_line(self, line):
+        return tuple(part.strip() for part in line.rstrip('|').split('|'))
     
     def tags(self):
         tags = tuple(tag[1:] for tag in self.match.group(1).strip().split())
@@ -225,6 +403,183 @@ class Parser(object):
         return tuple(arg.strip() for arg in self.match.groups())
 
 
+class State(object):
+    """Transitions of one parser state, matched by a single combined regex.
+    
+    Each row's pattern becomes one capturing alternative of the combined
+    regex, in table order, so the first alternative that matches a line
+    is the row the sequential lookup would have chosen. Rows without a
+    pattern are taken at the end of input.
+    """
+    
+    def __init__(self, rows, expected):
+        self.expected = expected
+        self.end = None
+        self.rows = []
+        self.groups = dict()
+        alternatives = []
+        index = 1
+        for row in rows:
+            pattern = row[0]
+            if pattern is None:
+                if self.end is None:
+                    self.end = row
+                continue
+            self.groups[index] = len(self.rows), index, pattern.groups
+            self.rows.append(row)
+            alternatives.append('(%s)' % pattern.pattern)
+            index += pattern.groups + 1
+        self.regex = re.compile('|'.join(alternatives))
+        self.patterns = [row[0] for row in self.rows]
+        self._bytes_regex = None
+        self._bytes_patterns = None
+    
+    @property
+    def bytes_regex(self):
+        if self._bytes_regex is None:
+            self._bytes_regex = re.compile(to_bytes_pattern(self.regex.pattern))
+            self._bytes_patterns = [
+                re.compile(to_bytes_pattern(pattern.pattern))
+                for pattern in self.patterns
+            ]
+        return self._bytes_regex
+    
+    def match(self, parser, line):
+        return self.select(parser, self.regex, self.patterns, StateMatch, line)
+    
+    def match_bytes(self, parser, buffer, pos, endpos):
+        return self.select(parser, self.bytes_regex, self._bytes_patterns,
+            parser.bytes_match, buffer, pos, endpos)
+    
+    def select(self, parser, regex, patterns, wrap, *args):
+        match = regex.match(*args)
+        if match is None:
+            return None, None
+        n, index, count = self.groups[match.lastindex]
+        row = self.rows[n]
+        match = wrap(match, index, count)
+        guard = row[1]
+        if guard is None or guard(parser, match):
+            return match, row
+        for n in range(n + 1, len(self.rows)):
+            row = self.rows[n]
+            match = patterns[n].match(*args)
+            if match:
+                match = wrap(match, 0, patterns[n].groups)
+                if row[1] is None or row[1](parser, match):
+                    return match, row
+        return None, None
+
+
+def to_bytes_pattern(pattern):
+    # bytes patterns are ASCII only, let \w in tags also take UTF-8 sequences
+    return pattern.replace(r'[\w_]', r'[\w_\x80-\xff]').encode('utf-8')
+
+
+class StateMatch(object):
+    """The groups of one alternative inside a combined state match."""
+    __slots__ = ('match', 'index', 'count')
+    
+    def __init__(self, match, index, count):
+        self.match = match
+        self.index = index
+        self.count = count
+    
+    @property
+    def string(self):
+        return self.match.string
+    
+    def group(self, n=0):
+        return self.match.group(self.index + n)
+    
+    def groups(self):
+        return self.match.groups()[self.index:self.index + self.count]
+
+
+class BytesStateMatch(StateMatch):
+    """StateMatch on an encoded buffer, decoding groups when asked for."""
+    __slots__ = ('stop', 'encoding')
+    
+    def __init__(self, match, index, count, stop, encoding):
+        super(BytesStateMatch, self).__init__(match, index, count)
+        self.stop = stop
+        self.encoding = encoding
+    
+    @property
+    def string(self):
+        line = self.match.string[self.match.pos:self.stop]
+        return line.decode(self.encoding).replace('\r\n', '\n')
+    
+    def group(self, n=0):
+        value = self.match.group(self.index + n)
+        return value if value is None else value.decode(self.encoding)
+    
+    def groups(self):
+        return tuple(
+            value if value is None else value.decode(self.encoding)
+            for value in self.match.groups()[self.index:self.index + self.count]
+        )
+
+
+class ParseStats(object):
+    """Counters of where parsing time goes, filled in by Parser(stats=...).
+    
+    One instance may be passed to any number of parsers to sum up a
+    whole corpus. Rows are counted as if each state's transitions were
+    tried one after another, whitespace is the fallback after all rows.
+    """
+    
+    def __init__(self):
+        self.lines = collections.Counter()
+        self.block_lines = collections.Counter()
+        self.whitespace = collections.Counter()
+        self.attempts = collections.Counter()
+        self.misses = collections.Counter()
+        self.calls = collections.Counter()
+        self.time = collections.Counter()
+    
+    def add_line(self, key, state, row):
+        self.lines[key] += 1
+        if row is None:
+            tried = len(state.rows) - 1
+        else:
+            tried = state.rows.index(row)
+            if row[4] == 'whitespace':
+                self.whitespace[key] += 1
+            else:
+                self.attempts[key, row[4]] += 1
+        for row in state.rows[:tried]:
+            self.attempts[key, row[4]] += 1
+            self.misses[key, row[4]] += 1
+    
+    def add_block_line(self, key):
+        self.lines[key] += 1
+        self.block_lines[key] += 1
+    
+    def add_call(self, event, seconds):
+        self.calls[event] += 1
+        self.time[event] += seconds
+
+
+class TimingHandler(object):
+    """Pass calls on to handler, timing them into stats."""
+    
+    def __init__(self, handler, stats):
+        self.handler = handler
+        self.stats = stats
+    
+    def __getattr__(self, key):
+        method = getattr(self.handler, key)
+        def timed(*args):
+            start = timer()
+            try:
+                return method(*args)
+            finally:
+                self.stats.add_call(key, timer() - start)
+        setattr(self, key, timed)
+        return timed
+
+
 class LogHandler(object):
     
     def __getattr__(self, key):
@@ -232,5 +587,23 @@ class LogHandler(object):
             print('%s:%s' % (key, args))
         return log
 
+
+class EventHandler(object):
+    """Record handler calls as (event, args, line_no) tuples."""
+    
+    def __init__(self, parser):
+        self.parser = parser
+        self.events = []
+    
+    def __getattr__(self, key):
+        def event(*args):
+            self.events.append((key, args, self.parser.line_no))
+        setattr(self, key, event)
+        return event
+    
+    def flush(self):
+        events, self.events = self.events, []
+        return events
+
 #.............................................................................
 #   parser.py
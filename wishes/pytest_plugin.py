@@ -0,0 +1,79 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   pytest_plugin.py --- Collect feature files as pytest items
+#
+#  The plugin needs pytest 7 or later and is only used when asked for, with
+#  -p wishes.pytest_plugin or pytest_plugins in a conftest.py. Each scenario
+#  and each example of an outline is one item, marked with its tags. Steps
+#  are only matched when the feature of an item first runs.
+#=============================================================================
+from __future__ import unicode_literals
+
+import pytest
+
+from .compat import unittest
+from .loader import defaultLoader
+from .tagindex import iter_tests
+
+
+if int(pytest.__version__.split('.')[0]) < 7:
+    raise ImportError('wishes.pytest_plugin needs pytest 7 or later, not %s' % pytest.__version__)
+
+def pytest_addoption(parser):
+    group = parser.getgroup('wishes')
+    group.addoption('--feature-glob', action='append', dest='feature_globs', default=None,
+        help='glob of feature files to collect (default: *.feature)')
+    parser.addini('feature_globs', type='args', default=['*.feature'],
+        help='globs of feature files to collect')
+
+def pytest_collect_file(file_path, parent):
+    globs = parent.config.getoption('feature_globs') or parent.config.getini('feature_globs')
+    if any(file_path.match(glob) for glob in globs):
+        return FeatureFile.from_parent(parent, path=file_path)
+
+
+class FeatureFile(pytest.File):
+    """A feature file, collected from its syntax tree without building tests."""
+    
+    _feature_class = None
+    
+    def collect(self):
+        feature = defaultLoader.parse_feature_file(str(self.path))
+        markers = set(marker.split(':')[0].split('(')[0].strip() for marker in self.config.getini('markers'))
+        for method, line, tags in iter_tests(feature):
+            item = ScenarioItem.from_parent(self, name=method, line=line)
+            for tag in sorted(tags):
+                if tag not in markers:
+                    self.config.addinivalue_line('markers', '%s: feature tag' % tag)
+                    markers.add(tag)
+                item.add_marker(tag)
+            yield item
+    
+    def make_test(self, method):
+        """Return the FeatureTest of method, loading the feature on first use."""
+        if self._feature_class is None:
+            suite = defaultLoader.load_feature_file(str(self.path))
+            self._feature_class = type(next(iter(suite)))
+        return self._feature_class(method)
+
+
+class ScenarioItem(pytest.Item):
+    
+    def __init__(self, line=None, **kwargs):
+        super(ScenarioItem, self).__init__(**kwargs)
+        self.line = line
+    
+    def runtest(self):
+        test = self.parent.make_test(self.name)
+        test.result = test.current_tags = None
+        try:
+            test.debug()
+        except unittest.SkipTest as skipped:
+            pytest.skip(str(skipped))
+    
+    def reportinfo(self):
+        return self.path, None if self.line is None else self.line - 1, self.name
+
+#.............................................................................
+#   pytest_plugin.py
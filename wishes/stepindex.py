@@ -0,0 +1,175 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   stepindex.py --- Index of step definitions by required literals
+#=============================================================================
+from __future__ import unicode_literals
+
+import collections
+import re
+import threading
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+
+non_ascii_re = re.compile('[^\x00-\x7f]')
+
+def required_literal(pattern, size=3):
+    """Return the longest text any match of pattern contains, lowercased.
+    
+    Only runs of ASCII literals outside of alternatives and optional
+    repeats count. Returns None if there is no run of at least size
+    characters, or if pattern can't be parsed.
+    """
+    try:
+        tree = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    runs = ['']
+    collect_literals(tree, runs)
+    literal = max(runs, key=len)
+    return literal.lower() if len(literal) >= size else None
+
+def collect_literals(tree, runs):
+    for op, value in tree:
+        if op == sre_parse.LITERAL and value < 0x80:
+            runs[-1] += chr(value)
+            continue
+        runs.append('')
+        if op == sre_parse.SUBPATTERN:
+            collect_literals(value[-1], runs)
+            runs.append('')
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and value[0] >= 1:
+            collect_literals(value[2], runs)
+            runs.append('')
+
+def update_index(index, step_definitions):
+    """Return index updated to step_definitions, or a new StepIndex if it is of others."""
+    if index is None or index.step_definitions is not step_definitions \
+            or len(step_definitions) < index.count:
+        return StepIndex(step_definitions)
+    if not index.is_current(step_definitions):
+        index.update()
+    return index
+
+
+class StepIndex(object):
+    """Step definitions bucketed by trigrams of their literals.
+    
+    A definition can only match a text containing its required literal,
+    so only the buckets of the trigrams of a text are looked at, and the
+    literal is checked before the pattern is searched. Each definition
+    goes to the smallest bucket of the trigrams of its literal.
+    Definitions without such a literal are always candidates.
+    
+    Definitions with a literal attribute only match steps whose words
+    after the kind are that literal, and are looked up in a dict. Texts
+    with non-ASCII characters, which may match ASCII literals ignoring
+    case, look at all definitions.
+    """
+    size = 3
+    
+    def __init__(self, step_definitions):
+        self.step_definitions = step_definitions
+        self.count = 0
+        self.buckets = dict()
+        self.literals = dict()
+        self.unindexed = []
+        self.lock = threading.Lock()
+        self.update()
+    
+    def is_current(self, step_definitions):
+        return step_definitions is self.step_definitions and len(step_definitions) == self.count
+    
+    def update(self):
+        """Index the definitions added since the last update."""
+        with self.lock:
+            self.index_definitions()
+    
+    def index_definitions(self):
+        for n in range(self.count, len(self.step_definitions)):
+            step_definition = self.step_definitions[n]
+            literal = getattr(step_definition, 'literal', None)
+            if literal is not None and not non_ascii_re.search(literal):
+                self.literals.setdefault(literal, []).append((n, step_definition))
+                continue
+            pattern = getattr(step_definition, 'pattern', None)
+            literal = None if pattern is None else required_literal(pattern, self.size)
+            if literal is None:
+                self.unindexed.append((n, step_definition))
+            else:
+                trigrams = [literal[m:m + self.size] for m in range(len(literal) - self.size + 1)]
+                trigram = min(trigrams, key=lambda trigram: len(self.buckets.get(trigram, ())))
+                self.buckets.setdefault(trigram, []).append((n, literal, step_definition))
+        self.count = len(self.step_definitions)
+    
+    def candidates(self, s):
+        """Return the definitions that may match s, in order of definition."""
+        if non_ascii_re.search(s):
+            return list(self.step_definitions)
+        s = s.lower()
+        found = list(self.unindexed)
+        found.extend(self.literals.get(' '.join(s.split()[1:]), ()))
+        for trigram in set(s[n:n + self.size] for n in range(len(s) - self.size + 1)):
+            for n, literal, step_definition in self.buckets.get(trigram, ()):
+                if literal in s:
+                    found.append((n, step_definition))
+        found.sort(key=lambda entry: entry[0])
+        return [step_definition for n, step_definition in found]
+
+
+class StepCache(object):
+    """The last looked up steps with their definition and match.
+    
+    Entries are dropped least recently used first once there are more
+    than size. The cache is cleared when the version of the definitions
+    changes, or their list is replaced.
+    """
+    
+    def __init__(self, size=4096):
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.stamp = self.step_definitions = None
+        self.hits = self.misses = 0
+    
+    def check(self, version, step_definitions):
+        """Clear the cache unless it holds lookups of this version of step_definitions."""
+        stamp = (version, len(step_definitions))
+        if stamp != self.stamp or step_definitions is not self.step_definitions:
+            with self.lock:
+                self.entries.clear()
+                self.stamp = stamp
+                self.step_definitions = step_definitions
+    
+    def get(self, key):
+        with self.lock:
+            try:
+                value = self.entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self.entries[key] = value
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+    
+    def stats(self):
+        """Return hits, misses and the number of cached steps as dict."""
+        return dict(hits=self.hits, misses=self.misses, size=len(self.entries))
+
+#.............................................................................
+#   stepindex.py
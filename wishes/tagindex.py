@@ -0,0 +1,168 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   tagindex.py --- Corpus-wide index of scenario tags
+#=============================================================================
+from __future__ import unicode_literals
+
+import binascii
+import json
+import os
+
+from .compat import unittest
+from .examples import find_source
+from .feature import Hashes
+from .loader import Handler, defaultLoader, find_features
+from .tags import tag_expression
+
+
+class TagIndex(object):
+    """The tests of many feature files with their tags.
+    
+    Each test, a scenario or an example of an outline, has the tags of
+    its feature, Background, outline and Examples along with its own.
+    Tests are numbered, and the tests with a tag are kept as a bitset, so
+    tag expressions are evaluated by a few integer operations. The index
+    is stored as JSON and updated from the files whose mtime or size
+    changed.
+    """
+    version = 1
+    
+    def __init__(self, files=None, tests=None, bits=None):
+        self.files = dict() if files is None else files
+        if tests is None:
+            self.rebuild()
+        else:
+            self.tests = tests
+            self.bits = bits
+    
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as stream:
+                data = json.load(stream)
+        except (IOError, OSError, ValueError):
+            return cls()
+        if data.get('version') != cls.version:
+            return cls()
+        tests = [tuple(test) for test in data['tests']]
+        bits = dict((tag, int(value, 16)) for tag, value in data['bits'].items())
+        return cls(data['files'], tests, bits)
+    
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(path, 'w') as stream:
+            json.dump(dict(
+                version=self.version,
+                files=self.files,
+                tests=self.tests,
+                bits=dict((tag, '%x' % value) for tag, value in self.bits.items()),
+            ), stream)
+    
+    def update(self, paths, loader=None, encoding='utf-8'):
+        """Index the changed ones of paths and forget all other files.
+        
+        Returns True if the index changed.
+        """
+        if loader is None:
+            loader = defaultLoader
+        changed = False
+        seen = set()
+        for path in paths:
+            seen.add(path)
+            stat = os.stat(path)
+            entry = self.files.get(path)
+            if entry is not None and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                continue
+            feature = loader.parse_feature_file(path, encoding)
+            self.files[path] = dict(mtime=stat.st_mtime, size=stat.st_size, tests=[
+                [method, line, sorted(tags)] for method, line, tags in iter_tests(feature)
+            ])
+            changed = True
+        for path in set(self.files) - seen:
+            del self.files[path]
+            changed = True
+        if changed:
+            self.rebuild()
+        return changed
+    
+    def rebuild(self):
+        self.tests = []
+        ids = dict()
+        for path in sorted(self.files):
+            for method, line, tags in self.files[path]['tests']:
+                for tag in tags:
+                    ids.setdefault(tag, []).append(len(self.tests))
+                self.tests.append((path, method, line))
+        self.bits = dict((tag, make_bitset(tag_ids, len(self.tests))) for tag, tag_ids in ids.items())
+    
+    def select(self, expression):
+        """Return (path, method name, line) of the tests matching expression."""
+        bits = tag_expression(expression).select(self.bits, (1 << len(self.tests)) - 1)
+        return [self.tests[n] for n, bit in enumerate(bin(bits)[:1:-1]) if bit == '1']
+    
+    def paths(self, expression):
+        """Return the paths of the files with tests matching expression."""
+        paths = []
+        for path, method, line in self.select(expression):
+            if not paths or paths[-1] != path:
+                paths.append(path)
+        return paths
+    
+    def load_tests(self, expression, loader=None, test_case_class=None, scenario_class=None,
+            encoding='utf-8'):
+        """Load the tests matching expression into one suite."""
+        if loader is None:
+            loader = defaultLoader
+        expression = tag_expression(expression)
+        suite = unittest.TestSuite()
+        for path in self.paths(expression):
+            suite.addTest(loader.load_feature_file(path, test_case_class, scenario_class, encoding,
+                tags=expression))
+        return suite
+
+
+def iter_tests(feature):
+    """Yield method name, line and tags of the tests of a FeatureNode."""
+    if feature.title is None:
+        return
+    handler = Handler()
+    feature_tags = set(feature.tags or ())
+    background_tags = set()
+    tests = dict()
+    for block in feature.blocks:
+        tags = set(block.tags or ())
+        if block.kind == 'background':
+            background_tags = tags
+            continue
+        tags |= feature_tags | background_tags
+        if block.kind == 'scenario':
+            tests[handler.make_scenario_method_name(block.title)] = block.line, tags
+            continue
+        for examples in block.examples:
+            hashes = None if examples.keys is None else Hashes(examples.keys, examples.rows)
+            source = find_source(examples.title, feature.name)
+            for method, keys, row in handler.iter_examples(block.title, examples.title, hashes, source):
+                tests[method] = examples.line, tags | set(examples.tags or ())
+    for method in sorted(tests):
+        line, tags = tests[method]
+        yield method, line, tags
+
+def make_bitset(ids, size):
+    array = bytearray((size + 7) // 8)
+    for n in ids:
+        array[n >> 3] |= 1 << (n & 7)
+    array.reverse()
+    return int(binascii.hexlify(bytes(array)), 16) if array else 0
+
+def index_features(start_dir, index_path, include=('*.feature',), exclude=(), loader=None):
+    """Return the TagIndex of the features below start_dir, updated and saved at index_path."""
+    index = TagIndex.load(index_path)
+    if index.update(find_features(start_dir, include, exclude), loader) or not os.path.exists(index_path):
+        index.save(index_path)
+    return index
+
+#.............................................................................
+#   tagindex.py
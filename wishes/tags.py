@@ -0,0 +1,143 @@
+# -*- coding:utf-8 -*-
+# Created by Hans-Thomas on 2026-10-18.
+#=============================================================================
+#   tags.py --- Tag expressions
+#=============================================================================
+from __future__ import unicode_literals
+
+import re
+
+import six
+
+
+class TagExpressionError(ValueError):
+    pass
+
+
+class TagExpression(object):
+    """A boolean expression of tags, like '@smoke and not (@slow or @wip)'.
+    
+    Calling the expression with a set of tags tells if they match. The
+    leading @ of tags is optional, and the operators are not, and, or
+    in order of precedence.
+    """
+    token_re = re.compile(r'\s*(?:(\()|(\))|([^\s()]+))')
+    operators = ('and', 'or', 'not')
+    
+    def __init__(self, text):
+        self.text = text
+        self.tags = set()
+        self.uses_not = False
+        self.tokens = self.tokenize(text)
+        self.pos = 0
+        self.tree = self.parse_or()
+        if self.pos < len(self.tokens):
+            raise TagExpressionError('unexpected %r in tag expression %r' % (self.tokens[self.pos], text))
+        del self.tokens, self.pos
+        self.matches = self.compile(self.tree)
+    
+    def __call__(self, tags):
+        return self.matches(tags)
+    
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.text)
+    
+    def tokenize(self, text):
+        tokens = []
+        pos = 0
+        text = text.rstrip()
+        while pos < len(text):
+            match = self.token_re.match(text, pos)
+            tokens.append(match.group(match.lastindex))
+            pos = match.end()
+        return tokens
+    
+    def next_token(self):
+        if self.pos == len(self.tokens):
+            raise TagExpressionError('unexpected end of tag expression %r' % self.text)
+        self.pos += 1
+        return self.tokens[self.pos - 1]
+    
+    def peek(self, token):
+        return self.pos < len(self.tokens) and self.tokens[self.pos] == token
+    
+    def parse_or(self):
+        terms = [self.parse_and()]
+        while self.peek('or'):
+            self.pos += 1
+            terms.append(self.parse_and())
+        return terms[0] if len(terms) == 1 else ('or', terms)
+    
+    def parse_and(self):
+        terms = [self.parse_not()]
+        while self.peek('and'):
+            self.pos += 1
+            terms.append(self.parse_not())
+        return terms[0] if len(terms) == 1 else ('and', terms)
+    
+    def parse_not(self):
+        token = self.next_token()
+        if token == 'not':
+            self.uses_not = True
+            return ('not', self.parse_not())
+        if token == '(':
+            term = self.parse_or()
+            if self.next_token() != ')':
+                raise TagExpressionError('missing ) in tag expression %r' % self.text)
+            return term
+        if token == ')' or token in self.operators:
+            raise TagExpressionError('unexpected %r in tag expression %r' % (token, self.text))
+        tag = token[1:] if token.startswith('@') else token
+        self.tags.add(tag)
+        return ('tag', tag)
+    
+    @classmethod
+    def compile(cls, tree):
+        """Return a function telling if a set of tags matches tree."""
+        kind, value = tree
+        if kind == 'tag':
+            return lambda tags: value in tags
+        if kind == 'not':
+            term = cls.compile(value)
+            return lambda tags: not term(tags)
+        terms = [cls.compile(term) for term in value]
+        if kind == 'and':
+            return lambda tags: all(term(tags) for term in terms)
+        return lambda tags: any(term(tags) for term in terms)
+    
+    def select(self, bits, universe):
+        """Return the bitset of the items matching the expression.
+        
+        bits maps each tag to the bitset of the items having it, universe
+        is the bitset of all items.
+        """
+        return self.select_tree(self.tree, bits, universe)
+    
+    @classmethod
+    def select_tree(cls, tree, bits, universe):
+        kind, value = tree
+        if kind == 'tag':
+            return bits.get(value, 0)
+        if kind == 'not':
+            return universe & ~cls.select_tree(value, bits, universe)
+        selected = [cls.select_tree(term, bits, universe) for term in value]
+        result = selected[0]
+        for other in selected[1:]:
+            result = result & other if kind == 'and' else result | other
+        return result
+
+
+def tag_expression(value):
+    """Return value as TagExpression.
+    
+    Value may be a TagExpression, its text, or a list of tags of which
+    any one must match. None is passed through.
+    """
+    if value is None or isinstance(value, TagExpression):
+        return value
+    if not isinstance(value, six.string_types):
+        value = ' or '.join('@' + tag.lstrip('@') for tag in value)
+    return TagExpression(value)
+
+#.............................................................................
+#   tags.py